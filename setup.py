@@ -55,5 +55,5 @@ setup(
     ],
     keywords=["github", "octokit", "api"],
     install_requires=open("requirements.txt").readlines(),
-    extras_require={},
+    extras_require={"async": ["httpx"]},
 )
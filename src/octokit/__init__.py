@@ -1,94 +1,206 @@
-import copy
+import asyncio
+import json
 import re
-from collections import defaultdict
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 import requests
-from octokit_routes import specifications
 
-from octokit import utils
+from octokit import errors
 from octokit.base import Base
+from octokit.deadline import as_deadline
+from octokit.graphql import GRAPHQL_OPERATION
+from octokit.response import ResponseData  # noqa: F401
+from octokit.response import ResponseList  # noqa: F401
+from octokit.response import wrap
+from octokit.routes import Namespace
+from octokit.routes import get_route_table
+from octokit.transport import ASYNC_TRANSPORT_OPTIONS
+from octokit.transport import AsyncTransport
+from octokit.transport import get_default_async_transport
 
 page_regex = re.compile(r'[\?\&]page=(\d+)[_&=%+\w\d]*>; rel="(\w+)"')
+PAGE_KEYS = (
+    "items",
+    "workflow_runs",
+    "workflows",
+    "check_runs",
+    "check_suites",
+    "jobs",
+    "artifacts",
+    "caches",
+    "runners",
+    "runner_groups",
+    "secrets",
+    "variables",
+    "environments",
+    "repositories",
+    "installations",
+    "deployment_protection_rules",
+)
+
+
+def page_items(page_json, key=None):
+    """Returns the list in a page: the page itself, its ``key`` field, or the list wrapped by search and Actions
+    endpoints in one of ``PAGE_KEYS`` such as ``items``, ``workflow_runs`` or ``check_runs``. Raises
+    ``OctokitPaginationError`` for objects without such a list, such as error responses."""
+    if key is not None:
+        return page_json[key]
+    if not isinstance(page_json, dict):
+        return page_json
+    key = next((key for key in PAGE_KEYS if isinstance(page_json.get(key), list)), None)
+    if key is None:
+        raise errors.OctokitPaginationError("page has no list of items: {}".format(page_json.get("message", page_json)))
+    return page_json[key]
+
+
+def last_known_page(response, page):
+    """Returns the last page that can be requested after ``page``, from its ``last`` link or else its ``next`` link."""
+    return getattr(response, "last_page", None) or getattr(response, "next_page", page)
 
 
 class Octokit(Base):
     def __init__(self, *args, **kwargs):
         super().__init__()
-        self._create(specifications[kwargs.get("routes", "api.github.com")])
+        self._routes = get_route_table(kwargs.get("routes", "api.github.com"))
+        self._setup_validation(kwargs)
+        self._setup_transport(kwargs)
+        self.cache = kwargs.get("cache")
+        self.rate_limiter = kwargs.get("rate_limiter")
+        self.retry = kwargs.get("retry")
+        self.timeout = kwargs.get("timeout")
         self._setup_authentication(kwargs)
 
-    def _create(self, definitions):
-        classes = self._create_classes(definitions)
-        bases = [object]
-        for cls_name, class_attributes in classes.items():
-            cls = type(cls_name, tuple(bases), class_attributes)
-            setattr(self, cls_name, cls)
-
-    def _create_classes(self, definitions):
-        class_attributes = defaultdict(dict)
-        for path, path_object in definitions["paths"].items():
-            for method, method_object in path_object.items():
-                cls_name, methods = self._get_class_methods(method_object, method, path)
-                class_attributes[cls_name].update(methods)
-        return class_attributes
-
-    def _create_method(self, name, definition, method, path):
-        def _api_call(*args, **kwargs):
-            method_headers = kwargs.pop("headers") if kwargs.get("headers") else {}
-            self.validate(kwargs, definition)
-            requests_kwargs = {"headers": self._get_headers(method_headers)}
-            parameter_map = self._get_parameters(definition, method)
-            url, data_kwargs = self._form_url(kwargs, path, parameter_map)
-            requests_kwargs.update(self._data(data_kwargs, parameter_map, method))
-            requests_kwargs.update(self._auth(requests_kwargs))
-            _response = getattr(requests, method)(url, **requests_kwargs)
-            try:
-                attributes = _response.json()
-            except ValueError:
-                attributes = _response.text
-            new_self = copy.deepcopy(self)
-            setattr(new_self, "_response", _response)
-            setattr(new_self, "json", attributes)
-            setattr(new_self, "response", new_self._convert_to_object(attributes))
-            return new_self
-
-        _api_call.__name__ = name
-        _api_call.__doc__ = definition["description"]
-        return _api_call
-
-    def _get_names_from_operation_id(self, _object):
-        _cls_name, _id_name = _object.get("operationId").split("/")
-        cls_name = utils.snake_case(str(_cls_name))
-        method_id_name = utils.snake_case(str(_id_name))
-        return cls_name, method_id_name
-
-    def _get_deprecated_methods(self, methods, method_object):
-        deprecated_methods = {}
-        if method_object.get("x-changes"):
-            for change in method_object["x-changes"]:
-                if change.get("type") == "operation":
-                    before_cls, before_name = self._get_names_from_operation_id(change.get("before"))
-                    after_cls, after_name = self._get_names_from_operation_id(change.get("after"))
-                    if before_cls == after_cls and methods.get(after_name):
-                        deprecated_methods.update({before_name: methods[after_name]})
-        return deprecated_methods
-
-    def _get_class_methods(self, method_object, method, path):
-        cls_name, method_id_name = self._get_names_from_operation_id(method_object)
-        method_name = utils.snake_case(str(method_object.get("summary")))
-        methods = {
-            method_id_name: self._create_method(method_id_name, method_object, method, path),
-            method_name: self._create_method(method_name, method_object, method, path),
-        }
-        methods.update(self._get_deprecated_methods(methods, method_object))
-        return cls_name, methods
+    def __getattr__(self, name):
+        namespace = None if name.startswith("_") else self._namespaces().get(name)
+        if namespace is None:
+            raise AttributeError("{!r} object has no attribute {!r}".format(type(self).__name__, name))
+        bound = self.__dict__[name] = namespace(self)
+        return bound
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._namespaces()))
+
+    def _namespaces(self):
+        return self._routes.namespaces
+
+    def _setup_installation_authentication(self, kwargs):
+        super()._setup_installation_authentication(kwargs)
+        self._authenticate()
+
+    def _api_call(self, operation, *args, **kwargs):
+        self._authenticate()
+        plan = operation.plan
+        url, requests_kwargs, url_values, deadline = self._prepare_request(plan, kwargs)
+        _response = self._send_with_retries(plan, url, requests_kwargs, deadline)
+        return self._create_result(_response, self._copy_on_write_attribute_cache("url", url_values))
+
+    def _send_with_retries(self, plan, url, requests_kwargs, deadline):
+        if self.retry is None or not self.retry.applies_to(plan):
+            return self._send(plan.method, url, requests_kwargs, deadline)
+        started, attempt = self.retry.start(), 0
+        while True:
+            response, error = self._try_send(plan.method, url, requests_kwargs, deadline)
+            delay = self.retry.next_delay(attempt, started, response, error)
+            if delay is None or (deadline is not None and not deadline.allows(delay)):
+                return self._response_or_raise(response, error)
+            time.sleep(delay)
+            attempt += 1
+
+    def _try_send(self, method, url, requests_kwargs, deadline):
+        try:
+            return self._send(method, url, requests_kwargs, deadline), None
+        except self.retry.exceptions as error:
+            return None, error
+
+    def _response_or_raise(self, response, error):
+        if error is not None:
+            raise error
+        return response
+
+    def _send(self, method, url, requests_kwargs, deadline):
+        if self.rate_limiter is None:
+            return self._send_cached(method, url, requests_kwargs, deadline)
+        key = self.rate_limiter.key(url, requests_kwargs)
+        for attempt in range(self.rate_limiter.max_attempts):
+            time.sleep(self._rate_limit_delay(key, deadline))
+            response = self._send_cached(method, url, requests_kwargs, deadline)
+            if not self.rate_limiter.update(key, response):
+                break
+        return response
+
+    def _rate_limit_delay(self, key, deadline):
+        delay = self.rate_limiter.acquire(key)
+        if deadline is not None and delay and not deadline.allows(delay):
+            message = "waiting {:.0f}s for the {} rate limit would exceed the deadline".format(delay, key[1])
+            raise errors.OctokitTimeoutError(message)
+        return delay
+
+    def _send_cached(self, method, url, requests_kwargs, deadline):
+        if self.cache is None or method != "get":
+            return self._transport_request(method, url, requests_kwargs, deadline)
+        key, entry, requests_kwargs = self.cache.prepare(url, requests_kwargs)
+        return self.cache.resolve(key, entry, self._transport_request(method, url, requests_kwargs, deadline))
+
+    def _transport_request(self, method, url, requests_kwargs, deadline):
+        if deadline is None:
+            return self.transport.request(method, url, **requests_kwargs)
+        requests_kwargs = dict(requests_kwargs, timeout=deadline.timeout(requests_kwargs.get("timeout")))
+        try:
+            return self.transport.request(method, url, **requests_kwargs)
+        except requests.Timeout as error:
+            if deadline.expired():
+                raise errors.OctokitTimeoutError("deadline of {}s exceeded".format(deadline.seconds)) from error
+            raise
+
+    def _prepare_request(self, plan, kwargs):
+        requests_kwargs, deadline = self._request_options(kwargs)
+        self.validate_plan(kwargs, plan)
+        url, data_kwargs, url_values = self._form_url(kwargs, plan.template, plan.parameters)
+        requests_kwargs.update(self._plan_data(data_kwargs, plan))
+        requests_kwargs.update(self._auth(requests_kwargs))
+        return url, requests_kwargs, url_values, deadline
+
+    def _request_options(self, kwargs):
+        method_headers = kwargs.pop("headers") if kwargs.get("headers") else {}
+        timeout = kwargs.pop("timeout", self.timeout)
+        deadline = as_deadline(kwargs.pop("deadline", None))
+        requests_kwargs = {"headers": self._get_headers(method_headers)}
+        if timeout is not None:
+            requests_kwargs["timeout"] = timeout
+        return requests_kwargs, deadline
+
+    def graphql(self, query, **kwargs):
+        """Sends a GraphQL ``query``; keyword arguments other than ``headers``, ``timeout`` and ``deadline`` are its
+        variables. Retries apply when the policy lists the ``"graphql"`` operation."""
+        self._authenticate()
+        url, requests_kwargs, deadline = self._prepare_graphql(query, kwargs)
+        _response = self._send_with_retries(GRAPHQL_OPERATION, url, requests_kwargs, deadline)
+        return self._create_result(_response, self._attribute_cache)
+
+    def _prepare_graphql(self, query, kwargs):
+        requests_kwargs, deadline = self._request_options(kwargs)
+        requests_kwargs["data"] = json.dumps({"query": query, "variables": kwargs}, sort_keys=True)
+        requests_kwargs.update(self._auth(requests_kwargs))
+        return self.base_url + "/graphql", requests_kwargs, deadline
+
+    def _create_result(self, _response, attribute_cache):
+        try:
+            attributes = _response.json()
+        except ValueError:
+            attributes = _response.text
+        result = object.__new__(type(self))
+        result.__dict__.update((k, v) for k, v in self.__dict__.items() if not isinstance(v, Namespace))
+        result._attribute_cache = attribute_cache
+        result._response = _response
+        result.json = attributes
+        result.response = result._convert_to_object(attributes)
+        return result
 
     def _convert_to_object(self, item):
-        if isinstance(item, dict):
-            return type("ResponseData", (object,), {k: self._convert_to_object(v) for k, v in item.items()})
-        if isinstance(item, list):
-            return list((self._convert_to_object(value) for index, value in enumerate(item)))
-        return item
+        return wrap(item)
 
     def set_pages(self, obj, previous_page_requested=None):
         response_headers = obj._response.headers
@@ -106,10 +218,236 @@ class Octokit(Base):
                 setattr(obj, "has_pages", False)
         return obj
 
-    def paginate(self, obj, page=1, **kwargs):
+    def paginate(self, obj, page=1, concurrency=1, deadline=None, **kwargs):
+        kwargs = self._with_deadline(kwargs, deadline)
         response = self.set_pages(obj(page=page, **kwargs))
         yield response.json
-        if hasattr(response, "is_last_page"):
+        if self._can_paginate_concurrently(response, concurrency):
+            yield from self._paginate_concurrently(obj, response, concurrency, kwargs)
+        elif hasattr(response, "is_last_page"):
             while not response.is_last_page:
                 response = self.set_pages(obj(page=response.next_page, **kwargs), response.next_page)
                 yield response.json
+
+    def _with_deadline(self, kwargs, deadline):
+        if deadline is not None:
+            kwargs["deadline"] = as_deadline(deadline)
+        return kwargs
+
+    def _can_paginate_concurrently(self, response, concurrency):
+        return concurrency > 1 and hasattr(response, "last_page") and not response.is_last_page
+
+    def _paginate_concurrently(self, obj, response, concurrency, kwargs):
+        pages = iter(range(response.next_page, response.last_page + 1))
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = deque(executor.submit(obj, page=page, **kwargs) for page in islice(pages, concurrency))
+            while futures:
+                result = futures.popleft().result()
+                futures.extend(executor.submit(obj, page=page, **kwargs) for page in islice(pages, 1))
+                yield result.json
+
+    def paginate_items(self, obj, page=1, lookahead=1, key=None, deadline=None, **kwargs):
+        """Yields the items of every page, fetching up to ``lookahead`` pages ahead in the background while the items
+        of the current page are consumed. See ``page_items`` for how wrapped lists are found."""
+        kwargs = self._with_deadline(kwargs, deadline)
+        with ThreadPoolExecutor(max_workers=max(lookahead, 1)) as executor:
+            for page_json in self._prefetch_pages(executor, obj, page, max(lookahead, 1), kwargs):
+                yield from page_items(page_json, key)
+
+    def _prefetch_pages(self, executor, obj, page, lookahead, kwargs):
+        futures = deque([(page, executor.submit(obj, page=page, **kwargs))])
+        try:
+            while futures:
+                page, future = futures.popleft()
+                response = self.set_pages(future.result(), page)
+                requested = futures[-1][0] if futures else page
+                for next_page in range(requested + 1, min(last_known_page(response, page), page + lookahead) + 1):
+                    futures.append((next_page, executor.submit(obj, page=next_page, **kwargs)))
+                yield response.json
+        finally:
+            for page, future in futures:
+                future.cancel()
+
+    def batch(self, calls, concurrency=10):
+        """Runs ``(namespace, method, kwargs)`` calls on up to ``concurrency`` threads.
+
+        Returns the results in the order of ``calls``, with the exception raised by a call in place of its result.
+        """
+        methods = self._batch_methods(calls)
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(method, **kwargs) for method, kwargs in methods]
+            return [future.exception() or future.result() for future in futures]
+
+    def _batch_methods(self, calls):
+        return [(getattr(getattr(self, namespace), method), kwargs) for namespace, method, kwargs in calls]
+
+
+class AsyncOctokit(Octokit):
+    """``Octokit`` with ``async def`` methods, running on a pooled asynchronous transport (requires ``httpx``)."""
+
+    def _namespaces(self):
+        return self._routes.async_namespaces
+
+    def _setup_transport(self, kwargs):
+        self.transport = None
+        if kwargs.get("transport"):
+            self.transport = kwargs["transport"]
+        elif any(option in kwargs for option in ASYNC_TRANSPORT_OPTIONS):
+            options = {option: kwargs[option] for option in ASYNC_TRANSPORT_OPTIONS if option in kwargs}
+            self.transport = AsyncTransport(**options)
+
+    def _get_transport(self):
+        return self.transport or get_default_async_transport()
+
+    def _setup_installation_authentication(self, kwargs):
+        Base._setup_installation_authentication(self, kwargs)
+        self._token_lock = None
+
+    async def _authenticate(self):
+        if getattr(self, "auth", None) != "installation":
+            return super()._authenticate()
+        token = self.installation_id is not None and self.token_manager.cached(self.installation_id)
+        if not token:
+            token = await self._refresh_installation_token()
+        self.token, self.expires_at = token.token, token.expires_at
+
+    async def _refresh_installation_token(self):
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        async with self._token_lock:
+            if self.installation_id is None:
+                self.installation_id = await self._get_installation_id()
+            return self.token_manager.cached(self.installation_id) or await self._app_auth_get_token(
+                self.installation_id
+            )
+
+    async def _get_installation_id(self):
+        manager = self.token_manager
+        path = manager.installation_path(**self._installation)
+        if manager.cached_installation_id(path) is None:
+            options = manager.request_options(self.timeout)
+            response = await self._get_transport().request("get", manager.base_url + path, **options)
+            manager.set_installation(path, response.json())
+        return manager.cached_installation_id(path)
+
+    async def _app_auth_get_token(self, installation_id):
+        url = self.token_manager.access_tokens_url(installation_id)
+        options = self.token_manager.request_options(self.timeout)
+        response = await self._get_transport().request("post", url, **options)
+        return self.token_manager.store(installation_id, response.json())
+
+    async def graphql(self, query, **kwargs):
+        await self._authenticate()
+        url, requests_kwargs, deadline = self._prepare_graphql(query, kwargs)
+        _response = await self._send_with_retries(GRAPHQL_OPERATION, url, requests_kwargs, deadline)
+        return self._create_result(_response, self._attribute_cache)
+
+    async def _api_call(self, operation, *args, **kwargs):
+        await self._authenticate()
+        plan = operation.plan
+        url, requests_kwargs, url_values, deadline = self._prepare_request(plan, kwargs)
+        _response = await self._send_with_retries(plan, url, requests_kwargs, deadline)
+        return self._create_result(_response, self._copy_on_write_attribute_cache("url", url_values))
+
+    async def _send_with_retries(self, plan, url, requests_kwargs, deadline):
+        if self.retry is None or not self.retry.applies_to(plan):
+            return await self._send(plan.method, url, requests_kwargs, deadline)
+        started, attempt = self.retry.start(), 0
+        while True:
+            response, error = await self._try_send(plan.method, url, requests_kwargs, deadline)
+            delay = self.retry.next_delay(attempt, started, response, error)
+            if delay is None or (deadline is not None and not deadline.allows(delay)):
+                return self._response_or_raise(response, error)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _try_send(self, method, url, requests_kwargs, deadline):
+        try:
+            return await self._send(method, url, requests_kwargs, deadline), None
+        except self.retry.exceptions as error:
+            return None, error
+
+    async def _send(self, method, url, requests_kwargs, deadline):
+        if self.rate_limiter is None:
+            return await self._send_cached(method, url, requests_kwargs, deadline)
+        key = self.rate_limiter.key(url, requests_kwargs)
+        for attempt in range(self.rate_limiter.max_attempts):
+            await asyncio.sleep(self._rate_limit_delay(key, deadline))
+            response = await self._send_cached(method, url, requests_kwargs, deadline)
+            if not self.rate_limiter.update(key, response):
+                break
+        return response
+
+    async def _send_cached(self, method, url, requests_kwargs, deadline):
+        if self.cache is None or method != "get":
+            return await self._transport_request(method, url, requests_kwargs, deadline)
+        key, entry, requests_kwargs = self.cache.prepare(url, requests_kwargs)
+        return self.cache.resolve(key, entry, await self._transport_request(method, url, requests_kwargs, deadline))
+
+    async def _transport_request(self, method, url, requests_kwargs, deadline):
+        if deadline is None:
+            return await self._get_transport().request(method, url, **requests_kwargs)
+        timeout = deadline.timeout()
+        try:
+            return await asyncio.wait_for(self._get_transport().request(method, url, **requests_kwargs), timeout)
+        except asyncio.TimeoutError as error:
+            raise errors.OctokitTimeoutError("deadline of {}s exceeded".format(deadline.seconds)) from error
+
+    async def paginate(self, obj, page=1, concurrency=1, deadline=None, **kwargs):
+        kwargs = self._with_deadline(kwargs, deadline)
+        response = self.set_pages(await obj(page=page, **kwargs))
+        yield response.json
+        if self._can_paginate_concurrently(response, concurrency):
+            async for page_json in self._paginate_concurrently(obj, response, concurrency, kwargs):
+                yield page_json
+        elif hasattr(response, "is_last_page"):
+            while not response.is_last_page:
+                response = self.set_pages(await obj(page=response.next_page, **kwargs), response.next_page)
+                yield response.json
+
+    async def _paginate_concurrently(self, obj, response, concurrency, kwargs):
+        pages = iter(range(response.next_page, response.last_page + 1))
+        tasks = deque(asyncio.ensure_future(obj(page=page, **kwargs)) for page in islice(pages, concurrency))
+        try:
+            while tasks:
+                result = await tasks.popleft()
+                tasks.extend(asyncio.ensure_future(obj(page=page, **kwargs)) for page in islice(pages, 1))
+                yield result.json
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def paginate_items(self, obj, page=1, lookahead=1, key=None, deadline=None, **kwargs):
+        kwargs = self._with_deadline(kwargs, deadline)
+        async for page_json in self._prefetch_pages(obj, page, max(lookahead, 1), kwargs):
+            for item in page_items(page_json, key):
+                yield item
+
+    async def _prefetch_pages(self, obj, page, lookahead, kwargs):
+        tasks = deque([(page, asyncio.ensure_future(obj(page=page, **kwargs)))])
+        try:
+            while tasks:
+                page, task = tasks.popleft()
+                response = self.set_pages(await task, page)
+                requested = tasks[-1][0] if tasks else page
+                for next_page in range(requested + 1, min(last_known_page(response, page), page + lookahead) + 1):
+                    tasks.append((next_page, asyncio.ensure_future(obj(page=next_page, **kwargs))))
+                yield response.json
+        finally:
+            for page, task in tasks:
+                task.cancel()
+
+    async def batch(self, calls, concurrency=10):
+        """Runs ``(namespace, method, kwargs)`` calls with at most ``concurrency`` of them in flight.
+
+        Returns the results in the order of ``calls``, with the exception raised by a call in place of its result.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        methods = self._batch_methods(calls)
+        return await asyncio.gather(
+            *(self._run_limited(semaphore, method, kwargs) for method, kwargs in methods), return_exceptions=True
+        )
+
+    async def _run_limited(self, semaphore, method, kwargs):
+        async with semaphore:
+            return await method(**kwargs)
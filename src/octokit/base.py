@@ -1,15 +1,16 @@
-import copy
-import datetime
 import json
-import re
 from collections import ChainMap
 from collections import defaultdict
 
-import requests
-from jose import jwt
-
 from octokit import errors
-from octokit import utils
+from octokit.plan import compile_plan
+from octokit.plan import get_required_parameters
+from octokit.tokens import app_jwt
+from octokit.tokens import get_token_manager
+from octokit.transport import TRANSPORT_OPTIONS
+from octokit.transport import Transport
+from octokit.transport import get_default_transport
+from octokit.validators import VALIDATION_MODES
 
 
 class Base(object):
@@ -19,6 +20,8 @@ class Base(object):
     def __init__(self):
         self.headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
         self._attribute_cache = defaultdict(dict)
+        self.transport = get_default_transport()
+        self.validation = "strict"
 
     def _get_headers(self, method_headers):
         return dict(ChainMap(method_headers, self.headers))
@@ -29,68 +32,32 @@ class Base(object):
         return required_params
 
     def validate(self, parameters, definition):
-        self.validate_required_parameters(parameters, self.get_required_parameters(definition))
-        schema = {}
-        if definition.get("requestBody"):
-            schema = definition["requestBody"]["content"]["application/json"]["schema"]
-            self.validate_schema(parameters, schema)
-        properties = schema.get("properties", {})
-        valid_parameters = [p["name"] for p in definition.get("parameters")] + list(properties.keys())
-        self.validate_other_parameters(parameters, valid_parameters, properties)
+        return self.validate_plan(parameters, compile_plan(definition, None, None))
+
+    def validate_plan(self, parameters, plan):
+        if self.validation == "off":
+            return True
+        self.validate_required_plan_parameters(parameters, plan)
+        plan.validators[self.validation](parameters)
+        self.validate_other_parameters(parameters, plan.valid_parameters)
         return True
 
-    def validate_other_parameters(self, parameters, valid_parameters, properties):
-        for parameter, value in parameters.items():
-            try:
-                assert parameter in valid_parameters
-            except AssertionError:
+    def validate_required_plan_parameters(self, parameters, plan):
+        missing = plan.required.difference(parameters)
+        if missing:
+            self._raise_required_parameter(min(missing, key=plan.path_parameters.index))
+        for required_parameter in plan.required:
+            if parameters[required_parameter] is None:
+                self._raise_must_have_value(required_parameter)
+
+    def validate_other_parameters(self, parameters, valid_parameters):
+        for parameter in parameters:
+            if parameter not in valid_parameters:
                 message = "{} is not a valid parameter".format(parameter)
                 raise errors.OctokitParameterError(message)
-            if properties.get(parameter):
-                self.validate_enum(parameter, value, properties)
-
-    def validate_enum(self, parameter, value, properties):
-        if properties.get(parameter).get("enum") and value not in properties.get(parameter).get("enum"):
-            message = "{} is not a valid option for {}; must be one of {}".format(
-                value, parameter, properties.get(parameter).get("enum")
-            )
-            raise errors.OctokitParameterError(message)
-
-    def validate_schema(self, parameters, schema):
-        if isinstance(parameters, list):
-            self.validate_list(parameters, schema)
-        if isinstance(parameters, dict):
-            self.validate_dict(parameters, schema)
-        self.validate_required_parameters(parameters, self.get_required_schema_properties(schema))
-        self.type_match(parameters, schema.get("type"))
-
-    def validate_dict(self, parameters, schema):
-        for parameter, value in parameters.items():
-            if isinstance(value, dict):
-                self.validate_schema(value, schema.get("properties").get(parameter))
-            if isinstance(value, list):
-                self.validate_schema(value, schema.get("properties").get(parameter))
-
-    def validate_list(self, parameters, schema):
-        if not parameters and schema.get("items").get("required"):
-            message = "property is missing required items"
-            raise errors.OctokitParameterError(message)
-        for parameter in parameters:
-            self.validate_schema(parameter, schema.get("items", schema))
-
-    def type_match(self, symbol, expected_type):
-        types = {"array": list, "object": dict, "string": str}
-        if not isinstance(symbol, types.get(expected_type)):
-            name = symbol.__class__.__name__
-            message = f"{name} type does not match the schema type of {expected_type} for the data of {symbol}"
-            raise errors.OctokitParameterError(message)
-
-    def get_required_schema_properties(self, schema):
-        if schema.get("type") == "object":
-            return schema.get("required")
 
     def get_required_parameters(self, definition):
-        return [p.get("name") for p in definition.get("parameters") if p.get("required") and p.get("in") in ("path",)]
+        return get_required_parameters(definition)
 
     def validate_required_parameters(self, parameters, required_parameters):
         for required_parameter in required_parameters or []:
@@ -109,56 +76,44 @@ class Base(object):
         message = "{} must have a value".format(required_parameter)
         raise errors.OctokitParameterError(message)
 
-    def _form_url(self, values, _url, params):
-        _values = dict(ChainMap(values, self._attribute_cache["url"]))
-        filtered_kwargs = {k: v for k, v in _values.items() if params.get(k)}
-        data_values = filtered_kwargs.copy()
-        for name, value in filtered_kwargs.items():
-            _url, subs = re.subn(rf"{{{name}}}", str(value), _url)
-            if subs != 0:
-                self._attribute_cache["url"][name] = data_values.pop(name)
-        url = "{}{}".format(self.base_url, _url)
-        return url, data_values
-
-    def _get_data(self, kwargs, params):
-        data = array_data = {}
-        for parameter_name, parameter in params.items():
-            if parameter.get("type") == "array":
-                array_data = self._get_array_data(parameter_name, parameter, kwargs)
-            data.update(self._get_default_data(parameter_name, parameter, kwargs))
-        return dict(ChainMap(data, array_data, kwargs))
-
-    def _get_default_data(self, parameter_name, parameter, kwargs):
-        data = {}
-        if parameter.get("in") in ("query", "body") and not kwargs.get(parameter_name):
-            if parameter.get("schema", parameter).get("default") is not None:
-                data[parameter_name] = self._get_parameter_for_type(parameter.get("schema", parameter))
-        return data
-
-    def _get_array_data(self, parameter_name, parameter, kwargs):
-        data = {}
-        properties = parameter.get("items", parameter).get("properties")
-        if properties:
-            for name, property_data in properties.items():
-                if property_data.get("default") and not kwargs.get(parameter_name):
-                    data[parameter_name] = self._get_parameter_for_type(property_data)
-        return data
-
-    def _get_parameter_for_type(self, schema):
-        if schema.get("type") == "boolean" and schema.get("default") == "true":
-            return True
-        if schema.get("type") == "boolean" and schema.get("default") == "false":
-            return False
-        return schema.get("default")
-
-    def _data(self, data_kwargs, params, method):
-        data = self._get_data(data_kwargs, params)
-        if method == "get":
+    def _form_url(self, values, template, params):
+        cached = self._attribute_cache.get("url", {})
+        url_values = {}
+        for name in template.names:
+            if name in values:
+                url_values[name] = values[name]
+            elif name in cached:
+                url_values[name] = cached[name]
+        data_values = {k: v for k, v in values.items() if k not in url_values and params.get(k)}
+        return self.base_url + template.expand(url_values), data_values, url_values
+
+    def _copy_on_write_attribute_cache(self, name, values):
+        cached = self._attribute_cache.get(name, {})
+        if all(k in cached and cached[k] == v for k, v in values.items()):
+            return self._attribute_cache
+        attribute_cache = defaultdict(dict, self._attribute_cache)
+        attribute_cache[name] = dict(cached, **values)
+        return attribute_cache
+
+    def _plan_data(self, data_kwargs, plan):
+        data = dict(data_kwargs)
+        data.update((k, v) for k, v in plan.defaults.items() if not data_kwargs.get(k))
+        if plan.method == "get":
             return {"params": data}
-        if method in ("post", "patch", "put", "delete"):
+        if plan.method in ("post", "patch", "put", "delete"):
             return {"data": json.dumps(data, sort_keys=True)}
         return {}
 
+    def _setup_validation(self, kwargs):
+        self.validation = kwargs.get("validation", "strict")
+        assert self.validation in VALIDATION_MODES
+
+    def _setup_transport(self, kwargs):
+        if kwargs.get("transport"):
+            self.transport = kwargs["transport"]
+        elif any(option in kwargs for option in TRANSPORT_OPTIONS):
+            self.transport = Transport(**{option: kwargs[option] for option in TRANSPORT_OPTIONS if option in kwargs})
+
     def _setup_authentication(self, kwargs):
         authentication_schemes = {
             "basic": self._setup_basic_authentication,
@@ -184,36 +139,39 @@ class Base(object):
     def _setup_installation_authentication(self, kwargs):
         assert kwargs["app_id"]
         assert kwargs["private_key"]
-        self.token, self.expires_at = self._app_auth_get_token(kwargs["app_id"], kwargs["private_key"])
+        self.token_manager = kwargs.get("token_manager") or get_token_manager(
+            kwargs["app_id"], kwargs["private_key"], self.base_url
+        )
+        self.installation_id = kwargs.get("installation_id")
+        self._installation = {k: kwargs[k] for k in ("owner", "repo", "org") if k in kwargs}
+        self.token = self.expires_at = None
         self.auth = kwargs["auth"]
         self.headers["accept"] = "application/vnd.github.machine-man-preview+json"
 
+    def _authenticate(self):
+        if getattr(self, "auth", None) == "app":
+            self.jwt = self._app_auth_get_jwt(self.app_id, self.private_key)
+        elif getattr(self, "auth", None) == "installation":
+            self._authenticate_installation()
+
+    def _authenticate_installation(self):
+        options = {"transport": self.transport, "timeout": getattr(self, "timeout", None)}
+        if self.installation_id is None:
+            self.installation_id = self.token_manager.installation_id(**self._installation, **options)
+        token = self.token_manager.get(self.installation_id, **options)
+        self.token, self.expires_at = token.token, token.expires_at
+
     def _setup_app_authentication(self, kwargs):
         assert kwargs["app_id"]
         assert kwargs["private_key"]
-        self.jwt = self._app_auth_get_jwt(kwargs["app_id"], kwargs["private_key"])
+        self.app_id = kwargs["app_id"]
+        self.private_key = kwargs["private_key"]
+        self.jwt = self._app_auth_get_jwt(self.app_id, self.private_key)
         self.auth = kwargs["auth"]
         self.headers["accept"] = "application/vnd.github.machine-man-preview+json"
 
-    def _app_auth_get_token(self, app_id, key):
-        headers = {
-            "Authorization": "Bearer {}".format(self._app_auth_get_jwt(app_id, key)),
-            "Accept": "application/vnd.github.machine-man-preview+json",
-        }
-        installation_url = "{}/app/installations".format(self.base_url)
-        installations = requests.get(installation_url, headers=headers).json()
-        self.installation_id = [x.get("id") for x in installations if str(x.get("app_id")) == app_id].pop()
-        installation_token_url = "{}/app/installations/{}/access_tokens".format(self.base_url, self.installation_id)
-        response = requests.post(installation_token_url, headers=headers).json()
-        return response["token"], response["expires_at"]
-
     def _app_auth_get_jwt(self, app_id, key):
-        payload = {
-            "iat": int(datetime.datetime.timestamp(datetime.datetime.now())),
-            "exp": int(datetime.datetime.timestamp(datetime.datetime.now())) + (9 * 60),
-            "iss": app_id,
-        }
-        return jwt.encode(payload, key, algorithm="RS256")
+        return app_jwt(app_id, key)
 
     def _auth(self, requests_kwargs):
         if getattr(self, "auth", None) == "basic":
@@ -228,17 +186,3 @@ class Base(object):
             headers.update(_headers.get(getattr(self, "auth", None)))
             return {"headers": headers}
         return {}
-
-    def _get_parameters(self, definition, method):
-        p = {}
-        if definition.get("requestBody"):
-            schema = copy.deepcopy(definition.get("requestBody")["content"]["application/json"]["schema"])
-            if schema["type"] == "object":
-                body_parameters = {}
-                for k, v in schema["properties"].items():
-                    v["in"] = "body"
-                    v["required"] = k in schema.get("required", {})
-                    body_parameters.update({k: v})
-                p.update(body_parameters)
-        p.update(utils.parameter_transform(definition.get("parameters")))
-        return p
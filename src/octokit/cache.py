@@ -0,0 +1,115 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from requests.structures import CaseInsensitiveDict
+
+from octokit import utils
+
+
+class LRUStorage(object):
+    """Thread-safe in-memory storage keeping the ``maxsize`` most recently used entries.
+
+    Any object with the same ``get``, ``set`` and ``delete`` methods can be used as the storage of a ``ResponseCache``.
+    Entries are plain dictionaries of strings, bytes and numbers so they can be pickled or serialized.
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class CachedResponse(object):
+    """The stored response served in place of a ``304 Not Modified``."""
+
+    from_cache = True
+
+    def __init__(self, entry, not_modified):
+        self.status_code = entry["status_code"]
+        self.headers = CaseInsensitiveDict(entry["headers"])
+        self.headers.update(not_modified.headers)
+        self.content = entry["content"]
+        self.url = entry["url"]
+        self.not_modified = not_modified
+
+    @property
+    def text(self):
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ResponseCache(object):
+    """Conditional request cache for GET operations keyed by url, parameters and the authenticated identity."""
+
+    def __init__(self, maxsize=1000, storage=None):
+        self.storage = storage if storage is not None else LRUStorage(maxsize)
+
+    def key(self, url, requests_kwargs):
+        parts = [
+            url,
+            sorted((str(k), str(v)) for k, v in requests_kwargs.get("params", {}).items()),
+            requests_kwargs.get("headers", {}).get("accept"),
+            utils.auth_identity(requests_kwargs),
+        ]
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    def prepare(self, url, requests_kwargs):
+        key = self.key(url, requests_kwargs)
+        entry = self.storage.get(key)
+        if entry is not None:
+            headers = dict(requests_kwargs["headers"], **self._conditional_headers(entry))
+            requests_kwargs = dict(requests_kwargs, headers=headers)
+        return key, entry, requests_kwargs
+
+    def _conditional_headers(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def resolve(self, key, entry, response):
+        if entry is not None and response.status_code == 304:
+            return CachedResponse(entry, response)
+        if response.status_code == 200:
+            self._store(key, response)
+        return response
+
+    def _store(self, key, response):
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if etag or last_modified:
+            entry = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "status_code": response.status_code,
+                "headers": dict(response.headers),
+                "content": response.content,
+                "url": str(response.url),
+            }
+            self.storage.set(key, entry)
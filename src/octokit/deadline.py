@@ -0,0 +1,43 @@
+import time
+
+from octokit import errors
+
+
+def as_deadline(value):
+    if value is None or isinstance(value, Deadline):
+        return value
+    return Deadline(value)
+
+
+class Deadline(object):
+    """A time budget shared by every request, retry and rate limit pause of a call or a whole pagination."""
+
+    def __init__(self, seconds, clock=time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+
+    def __repr__(self):
+        return "Deadline({!r})".format(self.seconds)
+
+    def remaining(self):
+        return self.expires_at - self.clock()
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired():
+            raise errors.OctokitTimeoutError("deadline of {}s exceeded".format(self.seconds))
+
+    def allows(self, delay):
+        return delay < self.remaining()
+
+    def timeout(self, timeout=None):
+        self.check()
+        remaining = self.remaining()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
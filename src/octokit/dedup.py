@@ -0,0 +1,97 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryDeliveryStore(object):
+    """Thread-safe set of the ``X-GitHub-Delivery`` ids seen in the last ``ttl`` seconds, bounded to ``maxsize``.
+
+    Any object with the same ``add``, ``discard`` and ``in`` operations can be used to deduplicate deliveries.
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, delivery_id):
+        with self._lock:
+            self._expire(self.clock())
+            return delivery_id in self._seen
+
+    def add(self, delivery_id):
+        """Records a delivery and returns whether it was new."""
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            if delivery_id in self._seen:
+                return False
+            self._seen[delivery_id] = now
+            while len(self._seen) > self.maxsize:
+                self._seen.popitem(last=False)
+            return True
+
+    def discard(self, delivery_id):
+        with self._lock:
+            self._seen.pop(delivery_id, None)
+
+    def _expire(self, now):
+        while self._seen and next(iter(self._seen.values())) <= now - self.ttl:
+            self._seen.popitem(last=False)
+
+
+class SQLiteDeliveryStore(object):
+    """Delivery ids kept for ``ttl`` seconds in an SQLite database that several processes can share.
+
+    Ids are recorded with a single upsert, so concurrent processes agree on which of them saw a delivery first.
+    Expired ids are deleted every ``prune_every`` additions.
+    """
+
+    def __init__(self, path, ttl=86400, prune_every=1000, clock=time.time):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.prune_every = prune_every
+        self.clock = clock
+        self._additions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("CREATE TABLE IF NOT EXISTS deliveries (id TEXT PRIMARY KEY, seen REAL NOT NULL)")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM deliveries").fetchone()[0]
+
+    def __contains__(self, delivery_id):
+        query = "SELECT 1 FROM deliveries WHERE id = ? AND seen > ?"
+        with self._lock:
+            return self._connection.execute(query, (delivery_id, self.clock() - self.ttl)).fetchone() is not None
+
+    def add(self, delivery_id):
+        """Records a delivery and returns whether it was new."""
+        now = self.clock()
+        query = (
+            "INSERT INTO deliveries (id, seen) VALUES (?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET seen = excluded.seen WHERE deliveries.seen <= ?"
+        )
+        with self._lock:
+            added = self._connection.execute(query, (delivery_id, now, now - self.ttl)).rowcount == 1
+            self._additions += 1
+            if self._additions % self.prune_every == 0:
+                self._connection.execute("DELETE FROM deliveries WHERE seen <= ?", (now - self.ttl,))
+            return added
+
+    def discard(self, delivery_id):
+        with self._lock:
+            self._connection.execute("DELETE FROM deliveries WHERE id = ?", (delivery_id,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
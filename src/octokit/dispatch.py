@@ -0,0 +1,194 @@
+import asyncio
+import inspect
+import threading
+from collections import defaultdict
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from octokit import errors
+from octokit.payload import PayloadView
+from octokit.webhook import event_names
+
+Event = namedtuple("Event", ["name", "action", "delivery_id", "payload"])
+
+
+class HandlerIndex(object):
+    """Handlers registered for webhook ``event``, ``event.action`` or ``"*"`` names.
+
+    The handlers of each ``event.action`` are collected on first use and kept in an index, so looking them up for a
+    delivery is one dict lookup.
+    """
+
+    def __init__(self):
+        self._handlers = defaultdict(list)
+        self._index = {}
+        self._lock = threading.Lock()
+
+    def on(self, *names):
+        """Decorator registering a handler for one or more ``event`` or ``event.action`` names."""
+
+        def register(handler):
+            for name in names:
+                self.add(name, handler)
+            return handler
+
+        return register
+
+    def add(self, name, handler):
+        if name not in event_names:
+            raise ValueError("{} is not a webhook event".format(name))
+        with self._lock:
+            self._handlers[name].append(handler)
+            self._index = {}
+
+    def handlers(self, name, action=None):
+        key = "{}.{}".format(name, action) if action else name
+        handlers = self._index.get(key)
+        if handlers is None:
+            handlers = self._index_handlers(name, key)
+        return handlers
+
+    def _index_handlers(self, name, key):
+        with self._lock:
+            keys = ("*", name, key) if key != name else ("*", name)
+            handlers = self._index[key] = tuple(h for k in keys for h in self._handlers.get(k, ()))
+            return handlers
+
+    def event(self, name, payload, delivery_id=None):
+        payload = payload if isinstance(payload, PayloadView) else PayloadView(payload)
+        return Event(name, payload.get("action"), delivery_id, payload)
+
+    def _is_duplicate(self, delivery_id, recorded):
+        """Records a new delivery; ``recorded`` deliveries were already recorded upstream, e.g. by the middleware."""
+        if recorded or delivery_id is None or self.dedup is None:
+            return False
+        return not self.dedup.add(delivery_id)
+
+    def _forget(self, delivery_id):
+        """Lets a delivery that could not be queued be dispatched again when GitHub redelivers it."""
+        if delivery_id is not None and self.dedup is not None:
+            self.dedup.discard(delivery_id)
+
+    def _handle_error(self, handler, event, error):
+        if self.on_error is not None:
+            self.on_error(event, handler, error)
+
+
+class Dispatcher(HandlerIndex):
+    """Runs the handlers of webhook deliveries on a thread pool.
+
+    At most ``max_pending`` handler calls are queued or running; ``dispatch`` waits up to ``timeout`` seconds for
+    room, by default not at all, and then raises ``OctokitBackpressureError``. Exceptions raised by handlers are
+    passed to ``on_error``. With a ``dedup`` store, deliveries whose id was already dispatched are dropped before their
+    payload is parsed; a delivery whose handlers could not all be queued is removed from the store again. Pass
+    ``recorded=True`` when the id was already recorded upstream, as the middleware signals with
+    ``environ["octokit.webhook.recorded"]``.
+    """
+
+    def __init__(self, max_workers=8, max_pending=100, timeout=0, on_error=None, executor=None, dedup=None):
+        super().__init__()
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.on_error = on_error
+        self.dedup = dedup
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def dispatch(self, name, payload, delivery_id=None, recorded=False):
+        """Queues the handlers of a delivery and returns their futures."""
+        if self._is_duplicate(delivery_id, recorded):
+            return []
+        try:
+            event = self.event(name, payload, delivery_id)
+            return [self._submit(handler, event) for handler in self.handlers(event.name, event.action)]
+        except Exception:
+            self._forget(delivery_id)
+            raise
+
+    def _submit(self, handler, event):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise errors.OctokitBackpressureError("{} webhook handlers are pending".format(self.max_pending))
+        future = self.executor.submit(self._run, handler, event)
+        future.add_done_callback(lambda future: self._slots.release())
+        return future
+
+    def _run(self, handler, event):
+        try:
+            return handler(event)
+        except Exception as error:
+            self._handle_error(handler, event, error)
+            raise
+
+    def close(self, wait=True):
+        self.executor.shutdown(wait=wait)
+
+
+class AsyncDispatcher(HandlerIndex):
+    """Runs the handlers of webhook deliveries as asyncio tasks; handlers may be coroutine functions.
+
+    ``dispatch`` is a coroutine that waits up to ``timeout`` seconds, by default not at all, for room among the
+    ``max_pending`` running handlers and returns the new tasks.
+    """
+
+    def __init__(self, max_pending=100, timeout=0, on_error=None, dedup=None):
+        super().__init__()
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.on_error = on_error
+        self.dedup = dedup
+        self._slots = None
+        self._tasks = set()
+
+    def _get_slots(self):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        return self._slots
+
+    async def dispatch(self, name, payload, delivery_id=None, recorded=False):
+        if self._is_duplicate(delivery_id, recorded):
+            return []
+        try:
+            event = self.event(name, payload, delivery_id)
+            return [await self._submit(handler, event) for handler in self.handlers(event.name, event.action)]
+        except Exception:
+            self._forget(delivery_id)
+            raise
+
+    async def _submit(self, handler, event):
+        try:
+            await self._acquire()
+        except asyncio.TimeoutError:
+            raise errors.OctokitBackpressureError("{} webhook handlers are pending".format(self.max_pending)) from None
+        task = asyncio.ensure_future(self._run(handler, event))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        return task
+
+    async def _acquire(self):
+        slots = self._get_slots()
+        if slots.locked():
+            await asyncio.wait_for(slots.acquire(), self.timeout)
+        else:
+            await slots.acquire()
+
+    def _task_done(self, task):
+        self._tasks.discard(task)
+        self._get_slots().release()
+        if not task.cancelled():
+            task.exception()
+
+    async def _run(self, handler, event):
+        try:
+            result = handler(event)
+            return await result if inspect.isawaitable(result) else result
+        except Exception as error:
+            self._handle_error(handler, event, error)
+            raise
+
+    async def join(self):
+        """Waits for the running handlers to finish."""
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def close(self, wait=True):
+        for task in self._tasks:
+            task.cancel()
@@ -1,2 +1,24 @@
 class OctokitParameterError(Exception):
     pass
+
+
+class OctokitRateLimitError(Exception):
+    pass
+
+
+class OctokitTimeoutError(Exception):
+    pass
+
+
+class OctokitGraphQLError(Exception):
+    def __init__(self, errors):
+        super().__init__("; ".join(error.get("message", "") for error in errors))
+        self.errors = errors
+
+
+class OctokitBackpressureError(Exception):
+    pass
+
+
+class OctokitPaginationError(Exception):
+    pass
@@ -0,0 +1,195 @@
+import json
+import re
+from collections import defaultdict
+from collections import namedtuple
+
+from octokit import errors
+from octokit.transport import TRANSPORT_ERRORS
+
+GraphQLOperation = namedtuple("GraphQLOperation", ["operation_id", "method"])
+GRAPHQL_OPERATION = GraphQLOperation("graphql", "post")
+
+MAX_NODES = 500000
+
+variable_regex = re.compile(r'"""[\s\S]*?"""|"(?:[^"\\]|\\.)*"|\$(\w+)')
+node_regex = re.compile(r"\b(?:first|last)\s*:\s*(\d+)|([{}])")
+
+
+def graphql_literal(value):
+    if isinstance(value, dict):
+        return "{" + ", ".join("{}: {}".format(k, graphql_literal(v)) for k, v in value.items()) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(graphql_literal(v) for v in value) + "]"
+    return json.dumps(value)
+
+
+def estimate_nodes(selection):
+    """Estimates the nodes a selection can return the way GitHub does: every connection counts its ``first``/``last``
+    multiplied by those of the connections it is nested in."""
+    nodes, limit, multipliers = 0, None, [1]
+    for match in node_regex.finditer(selection):
+        first, brace = match.groups()
+        if first:
+            limit = int(first)
+        elif brace == "{":
+            nodes += multipliers[-1] * limit if limit else 0
+            multipliers.append(multipliers[-1] * (limit or 1))
+            limit = None
+        else:
+            multipliers.pop()
+    return max(nodes, 1)
+
+
+class GraphQLQuery(object):
+    """One query of a batch: a single top level field, its variables and the connection to paginate, if any."""
+
+    __slots__ = ("selection", "variables", "connection", "data", "error")
+
+    def __init__(self, selection, variables, connection):
+        self.selection = selection
+        self.variables = variables
+        self.connection = connection.split(".") if connection else None
+        self.data = self.error = None
+
+    def render(self):
+        return variable_regex.sub(self._literal, self.selection)
+
+    def _literal(self, match):
+        """Inlines a variable; string literals are left as they are."""
+        name = match.group(1)
+        if name is None:
+            return match.group(0)
+        if name not in self.variables:
+            raise errors.OctokitParameterError("GraphQL variable ${} is not defined".format(name))
+        return graphql_literal(self.variables[name])
+
+    def add_page(self, page):
+        """Stores a page of the result and returns whether the connection has more pages."""
+        connection = self._get_connection(page)
+        if self.data is None:
+            self.data = page
+        elif connection is not None:
+            self._merge(connection)
+        if connection is None or not connection.get("pageInfo", {}).get("hasNextPage"):
+            return False
+        self.variables = dict(self.variables, cursor=connection["pageInfo"]["endCursor"])
+        return True
+
+    def _merge(self, connection):
+        merged = self._get_connection(self.data)
+        for key in ("nodes", "edges"):
+            if key in connection:
+                merged[key].extend(connection[key])
+        merged["pageInfo"] = connection["pageInfo"]
+
+    def _get_connection(self, page):
+        for key in self.connection or ():
+            page = page.get(key) if isinstance(page, dict) else None
+        return page if self.connection else None
+
+
+class GraphQLBatch(object):
+    """Merges many small GraphQL queries into aliased documents and splits the responses per query.
+
+    Each query is a single top level field such as ``repository(owner: $owner, name: $name) { stargazerCount }``;
+    its variables are inlined as literals and must all be given. A document holds at most ``max_queries`` queries and
+    ``max_nodes`` estimated nodes. Queries naming a ``connection`` (e.g. ``"issues"``) take a ``$cursor`` variable and
+    are sent again until its ``pageInfo.hasNextPage`` is false; the ``nodes`` and ``edges`` of all pages are merged.
+    """
+
+    def __init__(self, octokit, max_queries=50, max_nodes=MAX_NODES):
+        self.octokit = octokit
+        self.max_queries = max_queries
+        self.max_nodes = max_nodes
+        self._queries = []
+
+    def __len__(self):
+        return len(self._queries)
+
+    def add(self, selection, connection=None, **variables):
+        """Adds a query and returns its index in the results of ``execute``."""
+        if connection:
+            variables.setdefault("cursor", None)
+        query = GraphQLQuery(selection, variables, connection)
+        query.render()
+        self._queries.append(query)
+        return len(self._queries) - 1
+
+    def execute(self):
+        """Runs the queries and returns their data in the order they were added, with an exception in place of the
+        data of a query that failed."""
+        queries, pending = self._queries, self._queries
+        self._queries = []
+        while pending:
+            pending = [query for document in self._documents(pending) for query in self._run(document)]
+        return [query.error or query.data for query in queries]
+
+    def _run(self, queries):
+        try:
+            body = self.octokit.graphql(self.render(queries)).json
+        except TRANSPORT_ERRORS as error:
+            return self.fail(queries, error)
+        return self.resolve(queries, body)
+
+    def _documents(self, queries):
+        document, nodes = [], 0
+        for query in queries:
+            cost = estimate_nodes(query.render())
+            if document and (len(document) >= self.max_queries or nodes + cost > self.max_nodes):
+                yield document
+                document, nodes = [], 0
+            document.append(query)
+            nodes += cost
+        if document:
+            yield document
+
+    def render(self, queries):
+        fields = "\n".join("  q{}: {}".format(index, query.render()) for index, query in enumerate(queries))
+        return "query {\n" + fields + "\n}"
+
+    def resolve(self, queries, body):
+        """Hands each query its part of the response body and returns the queries that have another page."""
+        if not isinstance(body, dict) or not ("data" in body or "errors" in body):
+            body = {"errors": [{"message": "unexpected response: {!r}".format(body)}]}
+        data = body.get("data") or {}
+        query_errors = self._errors_by_alias(body.get("errors") or [], len(queries))
+        pending = []
+        for index, query in enumerate(queries):
+            alias = "q{}".format(index)
+            if alias in query_errors:
+                query.error = errors.OctokitGraphQLError(query_errors[alias])
+            elif query.add_page(data.get(alias)):
+                pending.append(query)
+        return pending
+
+    def fail(self, queries, error):
+        """Hands each query of a document that could not be sent an error caused by ``error``."""
+        for query in queries:
+            query.error = errors.OctokitGraphQLError([{"message": str(error)}])
+            query.error.__cause__ = error
+        return []
+
+    def _errors_by_alias(self, response_errors, count):
+        by_alias = defaultdict(list)
+        for error in response_errors:
+            for alias in (error.get("path") or [])[:1] or ["q{}".format(index) for index in range(count)]:
+                by_alias[alias].append(error)
+        return by_alias
+
+
+class AsyncGraphQLBatch(GraphQLBatch):
+    """``GraphQLBatch`` for ``AsyncOctokit``; ``execute`` is a coroutine."""
+
+    async def execute(self):
+        queries, pending = self._queries, self._queries
+        self._queries = []
+        while pending:
+            pending = [query for document in self._documents(pending) for query in await self._run(document)]
+        return [query.error or query.data for query in queries]
+
+    async def _run(self, queries):
+        try:
+            body = (await self.octokit.graphql(self.render(queries))).json
+        except TRANSPORT_ERRORS as error:
+            return self.fail(queries, error)
+        return self.resolve(queries, body)
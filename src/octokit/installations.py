@@ -0,0 +1,87 @@
+import threading
+
+from octokit import Octokit
+from octokit.ratelimit import RateLimiter
+from octokit.tokens import get_token_manager
+
+
+class InstallationPool(object):
+    """Hands out clients for the installations of one GitHub App, keyed by installation id.
+
+    The clients share the app's token manager and one transport, and each installation gets its own ``RateLimiter``
+    so fan-out jobs can pick the installations with the most budget left. ``client_options`` are passed to every
+    client, e.g. ``retry`` or ``timeout``.
+    """
+
+    def __init__(
+        self,
+        app_id,
+        private_key,
+        client_class=None,
+        token_manager=None,
+        transport=None,
+        rate_limit_options=None,
+        **client_options,
+    ):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.client_class = client_class or Octokit
+        self.token_manager = token_manager or get_token_manager(app_id, private_key, self.client_class.base_url)
+        self.transport = transport
+        self.rate_limit_options = rate_limit_options or {}
+        self.client_options = client_options
+        self._clients = {}
+        self._rate_limiters = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def client(self, installation_id=None, owner=None, repo=None, org=None):
+        if installation_id is None:
+            installation_id = self.token_manager.installation_id(
+                owner=owner, repo=repo, org=org, transport=self.transport, timeout=self.client_options.get("timeout")
+            )
+        with self._lock:
+            if installation_id not in self._clients:
+                self._clients[installation_id] = self._create_client(installation_id)
+            return self._clients[installation_id]
+
+    def _create_client(self, installation_id):
+        options = dict(self.client_options, transport=self.transport) if self.transport else self.client_options
+        return self.client_class(
+            auth="installation",
+            app_id=self.app_id,
+            private_key=self.private_key,
+            installation_id=installation_id,
+            token_manager=self.token_manager,
+            rate_limiter=self._get_rate_limiter(installation_id),
+            **options,
+        )
+
+    def rate_limiter(self, installation_id):
+        with self._lock:
+            return self._get_rate_limiter(installation_id)
+
+    def _get_rate_limiter(self, installation_id):
+        if installation_id not in self._rate_limiters:
+            options = dict(self.rate_limit_options, identity=installation_id)
+            self._rate_limiters[installation_id] = RateLimiter(**options)
+        return self._rate_limiters[installation_id]
+
+    def remaining(self, installation_id, resource="core"):
+        """The requests left for the installation until the reset, or ``None`` while it is unknown."""
+        rate_limiter = self.rate_limiter(installation_id)
+        budget = rate_limiter.budget((installation_id, resource))
+        if budget.remaining is None or budget.reset <= rate_limiter.clock():
+            return None
+        return budget.remaining
+
+    def by_budget(self, installation_ids, resource="core"):
+        """Sorts installations by the budget left, most first; installations without a known budget come first."""
+
+        def remaining(installation_id):
+            value = self.remaining(installation_id, resource)
+            return float("inf") if value is None else value
+
+        return sorted(installation_ids, key=remaining, reverse=True)
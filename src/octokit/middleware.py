@@ -0,0 +1,205 @@
+import io
+
+from octokit import webhook
+
+MAX_BODY_SIZE = 25 * 1024 * 1024
+BODY_KEY = "octokit.webhook.body"
+RECORDED_KEY = "octokit.webhook.recorded"
+WEBHOOK_HEADERS = ("X-GitHub-Delivery", "X-GitHub-Event", "User-Agent", "Content-Length") + webhook.SIGNATURE_HEADERS
+ENVIRON_KEYS = tuple(
+    (name, "CONTENT_LENGTH" if name == "Content-Length" else "HTTP_" + name.upper().replace("-", "_"))
+    for name in WEBHOOK_HEADERS
+)
+ASGI_HEADERS = {name.lower().encode("latin-1"): name for name in WEBHOOK_HEADERS}
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 413: "Payload Too Large"}
+
+
+class Delivery(object):
+    """The body of a webhook delivery, fed into the HMAC of its signature as it is read."""
+
+    def __init__(self, delivery_id, verifier, algorithm, signature, max_body_size):
+        self.delivery_id = delivery_id
+        self.verifier = verifier
+        self.mac = verifier.hmac(algorithm)
+        self.signature = signature
+        self.max_body_size = max_body_size
+        self.chunks = []
+        self.size = 0
+
+    def update(self, chunk):
+        self.size += len(chunk)
+        if self.size > self.max_body_size:
+            return False
+        self.mac.update(chunk)
+        self.chunks.append(chunk)
+        return True
+
+    def verified(self):
+        return self.verifier.matches(self.mac, self.signature)
+
+    def body(self):
+        return b"".join(self.chunks)
+
+
+class WebhookReceiver(object):
+    """Checks the headers of webhook deliveries posted to ``path`` before any of the body is read.
+
+    With a ``dedup`` store, the ``X-GitHub-Delivery`` id of a verified delivery is recorded in the store and
+    ``"octokit.webhook.recorded"`` is set in the environ or scope, so a dispatcher sharing the store does not record it
+    again. Deliveries whose id was already seen are answered with ``200`` without being passed on. A delivery is
+    removed from the store again when the application raises.
+    """
+
+    def __init__(
+        self,
+        app,
+        secret,
+        path="/",
+        events=None,
+        verify_user_agent=False,
+        max_body_size=MAX_BODY_SIZE,
+        dedup=None,
+    ):
+        self.app = app
+        self.verifier = secret if isinstance(secret, webhook.SignatureVerifier) else webhook.SignatureVerifier(secret)
+        self.path = path
+        self.events = events
+        self.verify_user_agent = verify_user_agent
+        self.max_body_size = max_body_size
+        self.dedup = dedup
+
+    def start(self, headers):
+        """Returns the status to reject the delivery with, or ``None`` and the ``Delivery`` to read the body into."""
+        signature = webhook.get_signature(headers)
+        if signature is None or signature[0] not in webhook.DIGESTS:
+            return 401, None
+        if not webhook.valid_headers(headers, self.events, self.verify_user_agent):
+            return 400, None
+        status = self._check_delivery(headers)
+        if status:
+            return status, None
+        delivery_id = headers["X-GitHub-Delivery"]
+        return None, Delivery(delivery_id, self.verifier, signature[0], signature[1], self.max_body_size)
+
+    def _check_delivery(self, headers):
+        if self.content_length(headers) > self.max_body_size:
+            return 413
+        return None
+
+    def content_length(self, headers):
+        try:
+            return int(headers.get("Content-Length") or 0)
+        except ValueError:
+            return 0
+
+    def finish(self, delivery):
+        if not delivery.verified():
+            return 401
+        if self.dedup is not None and not self.dedup.add(delivery.delivery_id):
+            return 200
+        return None
+
+    def context(self, delivery):
+        """The keys the verified delivery adds to the environ or scope."""
+        context = {BODY_KEY: delivery.body()}
+        if self.dedup is not None:
+            context[RECORDED_KEY] = True
+        return context
+
+    def forget(self, delivery):
+        if self.dedup is not None:
+            self.dedup.discard(delivery.delivery_id)
+
+
+class WebhookMiddleware(WebhookReceiver):
+    """WSGI middleware verifying GitHub webhook deliveries posted to ``path`` before they reach ``app``.
+
+    The body is read in chunks into the HMAC of the signature. Deliveries with invalid headers or signatures, or
+    bodies larger than ``max_body_size``, are rejected without calling ``app``. Verified bodies are passed on in
+    ``wsgi.input`` and as ``environ["octokit.webhook.body"]``; other requests go straight to ``app``.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") != self.path or environ.get("REQUEST_METHOD") != "POST":
+            return self.app(environ, start_response)
+        headers = {name: environ[key] for name, key in ENVIRON_KEYS if key in environ}
+        status, delivery = self.start(headers)
+        status = status or self._read(environ["wsgi.input"], delivery, self.content_length(headers))
+        status = status or self.finish(delivery)
+        if status:
+            return self._respond(status, start_response)
+        context = self.context(delivery)
+        body = context[BODY_KEY]
+        environ.update({"wsgi.input": io.BytesIO(body), "CONTENT_LENGTH": str(len(body))})
+        environ.update(context)
+        try:
+            return self.app(environ, start_response)
+        except Exception:
+            self.forget(delivery)
+            raise
+
+    def _read(self, stream, delivery, remaining):
+        while remaining > 0:
+            chunk = stream.read(min(self.chunk_size, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            if not delivery.update(chunk):
+                return 413
+        return None
+
+    def _respond(self, status, start_response):
+        start_response("{} {}".format(status, STATUS_REASONS[status]), [("Content-Type", "text/plain")])
+        return [STATUS_REASONS[status].encode("utf-8")]
+
+
+class BodyReplay(object):
+    """An ASGI ``receive`` callable that returns the verified body before delegating to the server's."""
+
+    def __init__(self, body, receive):
+        self.body = body
+        self.receive = receive
+
+    async def __call__(self):
+        if self.body is None:
+            return await self.receive()
+        body, self.body = self.body, None
+        return {"type": "http.request", "body": body, "more_body": False}
+
+
+class AsyncWebhookMiddleware(WebhookReceiver):
+    """ASGI version of ``WebhookMiddleware``; the verified body is also available as
+    ``scope["octokit.webhook.body"]``."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+        headers = {ASGI_HEADERS[k]: v.decode("latin-1") for k, v in scope["headers"] if k in ASGI_HEADERS}
+        status, delivery = self.start(headers)
+        status = status or await self._read(receive, delivery)
+        status = status or self.finish(delivery)
+        if status:
+            return await self._respond(status, send)
+        context = self.context(delivery)
+        try:
+            await self.app(dict(scope, **context), BodyReplay(context[BODY_KEY], receive), send)
+        except Exception:
+            self.forget(delivery)
+            raise
+
+    async def _read(self, receive, delivery):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return 400
+            if not delivery.update(message.get("body", b"")):
+                return 413
+            if not message.get("more_body"):
+                return None
+
+    async def _respond(self, status, send):
+        headers = [(b"content-type", b"text/plain")]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": STATUS_REASONS[status].encode("utf-8")})
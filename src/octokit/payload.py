@@ -0,0 +1,212 @@
+import json
+import re
+from collections.abc import Mapping
+
+whitespace_regex = re.compile(rb"[ \t\n\r]*")
+colon_regex = re.compile(rb"[ \t\n\r]*:")
+string_regex = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+scalar_regex = re.compile(rb"[^,}\] \t\n\r]*")
+BRACKETS = {b"{": 1, b"[": 1, b"}": -1, b"]": -1}
+NESTING = 16
+
+
+def nested_regex(depth):
+    """Matches strings and balanced objects and arrays nested up to ``depth`` levels, so skipping a value takes a
+    Python step only per ``depth`` levels of nesting."""
+    flat = rb'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*'
+    pattern = flat
+    for _ in range(depth):
+        pattern = flat + rb"(?:[\[{]" + pattern + rb"[\]}]" + flat + rb")*"
+    return re.compile(pattern)
+
+
+balanced_regex = nested_regex(NESTING)
+
+
+def loads(buffer):
+    return json.loads(bytes(buffer) if isinstance(buffer, memoryview) else buffer)
+
+
+class PayloadView(Mapping):
+    """Read-only view of a webhook payload that is parsed at most once.
+
+    ``get`` accepts dotted paths such as ``"repository.full_name"``. Until the whole payload is needed, only the
+    requested top level fields are decoded. A field is found by scanning forward from the start, skipping the values
+    before it without decoding them, or, when the key last occurs closer to the end, by checking that this occurrence
+    is at the top level from the fields after it. GitHub puts ``action`` first and ``repository``, ``sender`` and
+    ``installation`` last, so filtering on them does not go through the event's large objects in between. Keys that
+    may be spelled with escapes are scanned for from the start when no occurrence of their plain spelling is found.
+    """
+
+    def __init__(self, body):
+        self.body = body
+        self._data = body if isinstance(body, (dict, list)) else None
+        self._buffer = body.encode("utf-8") if isinstance(body, str) else body
+        self._values = {}
+        self._fields = {}
+        self._position = None
+
+    def __repr__(self):
+        return "PayloadView({!r})".format(self._data if self._data is not None else self.body)
+
+    @property
+    def data(self):
+        """The fully parsed payload."""
+        if self._data is None:
+            self._data = loads(self._buffer)
+        return self._data
+
+    def __getitem__(self, key):
+        if key not in self._fields:
+            self._fields[key] = self._field(key)
+        return self._fields[key]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, path, default=None):
+        value = self
+        for key in path.split("."):
+            try:
+                value = value[key]
+            except (KeyError, TypeError, IndexError):
+                return default
+        return value
+
+    def _field(self, key):
+        if self._data is None and key not in self._values:
+            self._locate(key)
+        if self._data is not None:
+            return self._data[key]
+        if key not in self._values:
+            raise KeyError(key)
+        start, end = self._values[key]
+        return loads(self._buffer[start:end])
+
+    def _locate(self, key):
+        if self._position is None:
+            self._start()
+        if self._position != -1 and not self._search(key) and not self._spelled_once(key):
+            self._scan_until(key)
+
+    def _search(self, key):
+        """Looks ``key`` up from its occurrences; returns whether it was found or all fields were scanned."""
+        for occurrence in self._occurrences(key):
+            if occurrence - self._position < len(self._buffer) - occurrence:
+                self._scan_until(key)
+                return True
+            self._check_top_level(occurrence)
+            if key in self._values:
+                return True
+        return False
+
+    def _spelled_once(self, key):
+        """Whether ``key`` can only be written one way in this body, so it is missing if no occurrence was found."""
+        return b"\\u" not in self._buffer and ("/" not in key or b"\\/" not in self._buffer)
+
+    def _occurrences(self, key):
+        """Yields where ``key`` occurs as a key after the scanned fields: the next field if it is ``key``, then from the
+        last occurrence to the first."""
+        needle = json.dumps(key, ensure_ascii=False).encode("utf-8")
+        if self._buffer.startswith(needle, self._position):
+            yield self._position
+        position = self._buffer.rfind(needle, self._position)
+        while position != -1:
+            if colon_regex.match(self._buffer, position + len(needle)) and not self._escaped(position):
+                yield position
+            position = self._buffer.rfind(needle, self._position, position)
+
+    def _escaped(self, position):
+        start = position
+        while start > 0 and self._character(start - 1) == b"\\":
+            start -= 1
+        return (position - start) % 2 == 1
+
+    def _start(self):
+        if isinstance(self._buffer, memoryview):
+            self._buffer = bytes(self._buffer)
+        position = self._skip_whitespace(0)
+        if self._character(position) != b"{":
+            self._position = -1
+            self._data = loads(self._buffer)
+        else:
+            self._position = self._skip_whitespace(position + 1)
+
+    def _scan_until(self, key):
+        """Scans forward field by field; ``_position`` is -1 once the whole object was scanned."""
+        while self._position != -1 and key not in self._values:
+            if self._character(self._position) == b"}":
+                self._position = -1
+            else:
+                name, start, end = self._read_field(self._position)
+                self._values[name] = start, end
+                self._position = self._next_field(end)
+
+    def _check_top_level(self, position):
+        """Reads the fields from ``position`` to the end of their object and keeps them if it is the payload."""
+        fields = {}
+        while self._character(position) != b"}":
+            name, start, end = self._read_field(position)
+            fields[name] = start, end
+            position = self._next_field(end)
+        if self._skip_whitespace(position + 1) == len(self._buffer):
+            self._values.update(fields)
+
+    def _read_field(self, position):
+        end = self._match(string_regex, position)
+        name = loads(self._buffer[position:end])
+        start = self._skip_whitespace(self._expect(b":", end))
+        return name, start, self._skip_value(start)
+
+    def _skip_value(self, position):
+        character = self._character(position)
+        if character == b'"':
+            return self._match(string_regex, position)
+        if character in BRACKETS:
+            return self._skip_brackets(position)
+        return self._match(scalar_regex, position)
+
+    def _skip_brackets(self, position):
+        depth = 0
+        while True:
+            change = BRACKETS.get(self._character(position))
+            if change is None:
+                raise self._error("Unterminated object or array", position)
+            depth, position = depth + change, position + 1
+            if depth == 0:
+                return position
+            position = balanced_regex.match(self._buffer, position).end()
+
+    def _next_field(self, position):
+        position = self._skip_whitespace(position)
+        delimiter = self._character(position)
+        if delimiter == b",":
+            return self._skip_whitespace(position + 1)
+        if delimiter == b"}":
+            return position
+        raise self._error("Expecting ',' delimiter", position)
+
+    def _match(self, regex, position):
+        match = regex.match(self._buffer, position)
+        if match is None:
+            raise self._error("Expecting value", position)
+        return match.end()
+
+    def _character(self, position):
+        end = position + 1
+        return bytes(self._buffer[position:end])
+
+    def _skip_whitespace(self, position):
+        return whitespace_regex.match(self._buffer, position).end()
+
+    def _expect(self, character, position):
+        position = self._skip_whitespace(position)
+        if self._character(position) != character:
+            raise self._error("Expecting {!r} delimiter".format(character.decode()), position)
+        return position + 1
+
+    def _error(self, message, position):
+        return json.JSONDecodeError(message, "", position)
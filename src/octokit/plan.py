@@ -0,0 +1,115 @@
+import copy
+from collections import namedtuple
+from types import MappingProxyType
+
+from octokit import utils
+from octokit.template import URLTemplate
+from octokit.validators import compile_validators
+
+_fields = [
+    "operation_id",
+    "method",
+    "path",
+    "template",
+    "parameters",
+    "path_parameters",
+    "query_parameters",
+    "body_parameters",
+    "required",
+    "valid_parameters",
+    "schema",
+    "properties",
+    "validators",
+    "defaults",
+]
+
+
+class RequestPlan(namedtuple("RequestPlan", _fields)):
+    """Everything about an operation that does not depend on the arguments of a call."""
+
+    __slots__ = ()
+
+
+def compile_plan(definition, method, path):
+    parameters = get_parameters(definition)
+    schema = get_request_body_schema(definition)
+    properties = schema.get("properties", {})
+    return RequestPlan(
+        operation_id=definition.get("operationId"),
+        method=method,
+        path=path,
+        template=URLTemplate(path or ""),
+        parameters=MappingProxyType(parameters),
+        path_parameters=_names_in(parameters, "path"),
+        query_parameters=_names_in(parameters, "query"),
+        body_parameters=_names_in(parameters, "body"),
+        required=frozenset(get_required_parameters(definition)),
+        valid_parameters=frozenset([p["name"] for p in definition.get("parameters")] + list(properties.keys())),
+        schema=schema or None,
+        properties=MappingProxyType(properties),
+        validators=MappingProxyType(compile_validators(schema)),
+        defaults=MappingProxyType(get_defaults(parameters)),
+    )
+
+
+def _names_in(parameters, location):
+    return tuple(name for name, parameter in parameters.items() if parameter.get("in") == location)
+
+
+def get_request_body_schema(definition):
+    if definition.get("requestBody"):
+        return definition["requestBody"]["content"]["application/json"]["schema"]
+    return {}
+
+
+def get_required_parameters(definition):
+    return [p.get("name") for p in definition.get("parameters") if p.get("required") and p.get("in") in ("path",)]
+
+
+def get_parameters(definition):
+    p = {}
+    if definition.get("requestBody"):
+        schema = copy.deepcopy(get_request_body_schema(definition))
+        if schema["type"] == "object":
+            body_parameters = {}
+            for k, v in schema["properties"].items():
+                v["in"] = "body"
+                v["required"] = k in schema.get("required", {})
+                body_parameters.update({k: v})
+            p.update(body_parameters)
+    p.update(utils.parameter_transform(definition.get("parameters")))
+    return p
+
+
+def get_defaults(parameters):
+    array_defaults = {}
+    defaults = {}
+    for parameter_name, parameter in parameters.items():
+        if parameter.get("type") == "array":
+            array_defaults.update(_get_array_defaults(parameter_name, parameter))
+        defaults.update(_get_default(parameter_name, parameter))
+    return dict(array_defaults, **defaults)
+
+
+def _get_default(parameter_name, parameter):
+    if parameter.get("in") in ("query", "body"):
+        if parameter.get("schema", parameter).get("default") is not None:
+            return {parameter_name: get_parameter_for_type(parameter.get("schema", parameter))}
+    return {}
+
+
+def _get_array_defaults(parameter_name, parameter):
+    data = {}
+    properties = parameter.get("items", parameter).get("properties")
+    for name, property_data in (properties or {}).items():
+        if property_data.get("default"):
+            data[parameter_name] = get_parameter_for_type(property_data)
+    return data
+
+
+def get_parameter_for_type(schema):
+    if schema.get("type") == "boolean" and schema.get("default") == "true":
+        return True
+    if schema.get("type") == "boolean" and schema.get("default") == "false":
+        return False
+    return schema.get("default")
@@ -0,0 +1,128 @@
+import threading
+import time
+
+from octokit import errors
+from octokit import utils
+
+secondary_limit_messages = ("secondary rate limit", "abuse detection")
+
+
+# Paths of the resources GitHub limits apart from ``core``, as named by the X-RateLimit-Resource header; the first
+# match wins.
+RESOURCE_PATHS = (
+    ("/graphql", "graphql"),
+    ("/search/code", "code_search"),
+    ("/search/", "search"),
+    ("/app-manifests/", "integration_manifest"),
+    ("/dependency-graph/snapshots", "dependency_snapshots"),
+    ("/code-scanning/sarifs", "code_scanning_upload"),
+    ("/actions/runners/registration-token", "actions_runner_registration"),
+)
+
+
+def get_resource(url):
+    return next((resource for path, resource in RESOURCE_PATHS if path in url), "core")
+
+
+class Budget(object):
+    """The rate limit of one resource for one identity, paced as a token bucket."""
+
+    __slots__ = ("limit", "remaining", "reset", "rate", "tokens", "updated", "paused_until")
+
+    def __init__(self, burst, now):
+        self.limit = self.remaining = self.reset = self.rate = None
+        self.tokens = burst
+        self.updated = now
+        self.paused_until = 0
+
+    def reserve(self, burst, now):
+        wait = max(0, self.paused_until - now)
+        if self.remaining is not None and self.remaining <= 0 and self.reset > now:
+            wait = max(wait, self.reset - now)
+        if self.rate:
+            self.tokens = min(burst, self.tokens + (now - self.updated) * self.rate) - 1
+            self.updated = now
+            wait = max(wait, -self.tokens / self.rate)
+        if self.remaining is not None:
+            self.remaining -= 1
+        return wait
+
+    def update(self, limit, remaining, reset, now):
+        self.limit, self.remaining, self.reset = limit, remaining, reset
+        self.rate = remaining / max(reset - now, 1) if remaining > 0 else None
+
+
+class RateLimiter(object):
+    """Tracks the rate limit budget per identity and resource and paces requests to spread it until the reset.
+
+    ``burst`` requests can be sent back to back before pacing starts. Requests that would have to wait longer than
+    ``max_wait`` seconds raise ``OctokitRateLimitError``. Secondary rate limits without a ``Retry-After`` header pause
+    the identity for ``secondary_wait`` seconds. A rate limited response is sent again up to ``max_attempts`` times.
+    The identity is derived from the credentials unless a fixed ``identity`` such as an installation id is given.
+    """
+
+    def __init__(self, burst=10, max_wait=None, secondary_wait=60, max_attempts=2, identity=None, clock=time.time):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1, got {}".format(max_attempts))
+        self.burst = burst
+        self.max_wait = max_wait
+        self.secondary_wait = secondary_wait
+        self.max_attempts = max_attempts
+        self.identity = identity
+        self.clock = clock
+        self._budgets = {}
+        self._lock = threading.Lock()
+
+    def key(self, url, requests_kwargs):
+        identity = self.identity if self.identity is not None else utils.auth_identity(requests_kwargs)
+        return identity, get_resource(url)
+
+    def budget(self, key):
+        with self._lock:
+            return self._get_budget(key)
+
+    def _get_budget(self, key):
+        if key not in self._budgets:
+            self._budgets[key] = Budget(self.burst, self.clock())
+        return self._budgets[key]
+
+    def acquire(self, key):
+        with self._lock:
+            wait = self._get_budget(key).reserve(self.burst, self.clock())
+        if self.max_wait is not None and wait > self.max_wait:
+            message = "rate limit for {} is exhausted; the next request is possible in {:.0f}s".format(key[1], wait)
+            raise errors.OctokitRateLimitError(message)
+        return wait
+
+    def update(self, key, response):
+        # Budgets stay under the key of the request, which is the one acquire() reads for the next request.
+        headers = response.headers
+        now = self.clock()
+        with self._lock:
+            budget = self._get_budget(key)
+            if headers.get("X-RateLimit-Remaining") is not None:
+                budget.update(*self._parse_limit(headers), now)
+            if self.is_rate_limited(response):
+                budget.paused_until = max(budget.paused_until, self._pause_until(budget, headers, now))
+                return True
+        return False
+
+    def _parse_limit(self, headers):
+        limit = int(headers.get("X-RateLimit-Limit", 0))
+        return limit, int(headers["X-RateLimit-Remaining"]), int(headers.get("X-RateLimit-Reset", 0))
+
+    def _pause_until(self, budget, headers, now):
+        if headers.get("Retry-After"):
+            return now + int(headers["Retry-After"])
+        if budget.remaining == 0:
+            return budget.reset
+        return now + self.secondary_wait
+
+    def is_rate_limited(self, response):
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if response.headers.get("Retry-After") or response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        return any(message in response.text.lower() for message in secondary_limit_messages)
@@ -0,0 +1,55 @@
+from collections.abc import Sequence
+
+
+def wrap(item):
+    if isinstance(item, dict):
+        return ResponseData(item)
+    if isinstance(item, list):
+        return ResponseList(item)
+    return item
+
+
+class ResponseData(object):
+    """Attribute access over a parsed JSON object; nested values are wrapped when they are accessed."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            return wrap(self._data[name])
+        except KeyError:
+            raise AttributeError("{!r} object has no attribute {!r}".format(type(self).__name__, name)) from None
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self._data))
+
+    def __repr__(self):
+        return "ResponseData({!r})".format(self._data)
+
+
+class ResponseList(Sequence):
+    """Sequence view over a parsed JSON array; items are wrapped when they are accessed."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ResponseList(self._data[index])
+        return wrap(self._data[index])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, ResponseList):
+            return self._data == other._data
+        return self._data == other
+
+    def __repr__(self):
+        return "ResponseList({!r})".format(self._data)
@@ -0,0 +1,102 @@
+import random
+import threading
+import time
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+IDEMPOTENT_METHODS = ("get", "head", "options", "put", "delete")
+TRANSIENT_STATUSES = (502, 503, 504)
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout) + ((httpx.TransportError,) if httpx else ())
+
+
+class RetryBudget(object):
+    """Limits retries to ``min_retries`` plus ``ratio`` of the requests made in the last ``window`` seconds.
+
+    One budget shared by all clients keeps an outage from multiplying the load with retries.
+    """
+
+    def __init__(self, ratio=0.2, min_retries=10, window=10, clock=time.monotonic):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self.clock = clock
+        self._started = clock()
+        self._requests = self._retries = 0
+        self._lock = threading.Lock()
+
+    def _roll(self):
+        if self.clock() - self._started >= self.window:
+            self._started = self.clock()
+            self._requests = self._retries = 0
+
+    def record_request(self):
+        with self._lock:
+            self._roll()
+            self._requests += 1
+
+    def withdraw(self):
+        with self._lock:
+            self._roll()
+            if self._retries >= self.min_retries + self.ratio * self._requests:
+                return False
+            self._retries += 1
+            return True
+
+
+class RetryPolicy(object):
+    """Retries transient failures with exponential backoff and full jitter.
+
+    Only ``methods`` are retried, plus the operation ids listed in ``operations`` (e.g. ``"issues/create"``) for
+    callers that know those calls are safe to repeat. ``deadline`` caps the total seconds spent on one call.
+    """
+
+    def __init__(
+        self,
+        max_attempts=3,
+        backoff=0.5,
+        max_backoff=30,
+        deadline=None,
+        methods=IDEMPOTENT_METHODS,
+        operations=(),
+        statuses=TRANSIENT_STATUSES,
+        exceptions=TRANSIENT_ERRORS,
+        budget=None,
+        clock=time.monotonic,
+    ):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.methods = frozenset(methods)
+        self.operations = frozenset(operations)
+        self.statuses = frozenset(statuses)
+        self.exceptions = tuple(exceptions)
+        self.budget = budget if budget is not None else RetryBudget()
+        self.clock = clock
+
+    def applies_to(self, plan):
+        return plan.method in self.methods or plan.operation_id in self.operations
+
+    def start(self):
+        self.budget.record_request()
+        return self.clock()
+
+    def next_delay(self, attempt, started, response=None, error=None):
+        if not self.is_transient(response, error) or attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if self.deadline is not None and self.clock() - started + delay > self.deadline:
+            return None
+        if not self.budget.withdraw():
+            return None
+        return delay
+
+    def is_transient(self, response, error):
+        if error is not None:
+            return isinstance(error, self.exceptions)
+        return response.status_code in self.statuses
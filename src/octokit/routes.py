@@ -0,0 +1,133 @@
+import threading
+
+from octokit_routes import specifications
+
+from octokit import utils
+from octokit.plan import compile_plan
+
+_route_tables = {}
+_route_tables_lock = threading.Lock()
+
+
+def get_route_table(routes):
+    definitions = specifications[routes]
+    key = (routes, definitions["info"]["version"])
+    table = _route_tables.get(key)
+    if table is None:
+        with _route_tables_lock:
+            table = _route_tables.get(key)
+            if table is None:
+                table = _route_tables[key] = RouteTable(definitions)
+    return table
+
+
+class Operation(object):
+    __slots__ = ("definition", "method", "path", "_plan")
+
+    def __init__(self, definition, method, path):
+        self.definition = definition
+        self.method = method
+        self.path = path
+        self._plan = None
+
+    @property
+    def plan(self):
+        if self._plan is None:
+            self._plan = compile_plan(self.definition, self.method, self.path)
+        return self._plan
+
+
+class Namespace(object):
+    __slots__ = ("_octokit",)
+
+    def __init__(self, octokit):
+        self._octokit = octokit
+
+
+class RouteTable(object):
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.operations = self._create_classes(definitions)
+        self.namespaces = self._create(self._create_method)
+        self._async_namespaces = None
+        self._async_namespaces_lock = threading.Lock()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def async_namespaces(self):
+        if self._async_namespaces is None:
+            with self._async_namespaces_lock:
+                if self._async_namespaces is None:
+                    self._async_namespaces = self._create(self._create_async_method)
+        return self._async_namespaces
+
+    def _create(self, create_method):
+        return {
+            cls_name: self._create_namespace(
+                cls_name, {name: create_method(*method) for name, method in methods.items()}
+            )
+            for cls_name, methods in self.operations.items()
+        }
+
+    def _create_namespace(self, cls_name, class_attributes):
+        class_attributes["__slots__"] = ()
+        return type(cls_name, (Namespace,), class_attributes)
+
+    def _create_classes(self, definitions):
+        class_attributes = {}
+        for path, path_object in definitions["paths"].items():
+            for method, method_object in path_object.items():
+                cls_name, methods = self._get_class_methods(method_object, method, path)
+                class_attributes.setdefault(cls_name, {}).update(methods)
+        return class_attributes
+
+    def _create_method(self, name, operation):
+        def _api_call(self, *args, **kwargs):
+            return self._octokit._api_call(operation, *args, **kwargs)
+
+        return self._describe(_api_call, name, operation)
+
+    def _create_async_method(self, name, operation):
+        async def _api_call(self, *args, **kwargs):
+            return await self._octokit._api_call(operation, *args, **kwargs)
+
+        return self._describe(_api_call, name, operation)
+
+    def _describe(self, _api_call, name, operation):
+        _api_call.__name__ = name
+        _api_call.__doc__ = operation.definition["description"]
+        _api_call.operation = operation
+        return _api_call
+
+    def _get_names_from_operation_id(self, _object):
+        _cls_name, _id_name = _object.get("operationId").split("/")
+        cls_name = utils.snake_case(str(_cls_name))
+        method_id_name = utils.snake_case(str(_id_name))
+        return cls_name, method_id_name
+
+    def _get_deprecated_methods(self, methods, method_object):
+        deprecated_methods = {}
+        if method_object.get("x-changes"):
+            for change in method_object["x-changes"]:
+                if change.get("type") == "operation":
+                    before_cls, before_name = self._get_names_from_operation_id(change.get("before"))
+                    after_cls, after_name = self._get_names_from_operation_id(change.get("after"))
+                    if before_cls == after_cls and methods.get(after_name):
+                        deprecated_methods.update({before_name: methods[after_name]})
+        return deprecated_methods
+
+    def _get_class_methods(self, method_object, method, path):
+        cls_name, method_id_name = self._get_names_from_operation_id(method_object)
+        method_name = utils.snake_case(str(method_object.get("summary")))
+        operation = Operation(method_object, method, path)
+        methods = {
+            method_id_name: (method_id_name, operation),
+            method_name: (method_name, operation),
+        }
+        methods.update(self._get_deprecated_methods(methods, method_object))
+        return cls_name, methods
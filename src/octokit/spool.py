@@ -0,0 +1,191 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError
+from contextlib import closing
+
+from octokit import errors
+
+SpooledDelivery = namedtuple("SpooledDelivery", ["offset", "delivery_id", "event", "headers", "body", "received"])
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS deliveries (offset INTEGER PRIMARY KEY AUTOINCREMENT, delivery_id TEXT, "
+    "event TEXT NOT NULL, headers TEXT NOT NULL, body BLOB NOT NULL, received REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS consumers (name TEXT PRIMARY KEY, offset INTEGER NOT NULL)",
+)
+
+
+class Spool(object):
+    """Append-only store of webhook deliveries in an SQLite database in WAL mode.
+
+    Deliveries are written by a background thread that commits whatever has queued up, at most ``batch_size`` at a
+    time, in one transaction with one fsync. ``append`` returns the offset of a delivery once its batch is on disk,
+    so a receiver can acknowledge it right away and leave the processing to a ``SpoolConsumer``. Consumers in other
+    processes open the same ``path``. If the writer fails, the deliveries waiting for it fail with its error and the
+    next ``append`` starts a new one.
+    """
+
+    def __init__(self, path, batch_size=100, clock=time.time):
+        self.path = os.fspath(path)
+        self.batch_size = batch_size
+        self.clock = clock
+        self._queue = queue.Queue()
+        self._writer = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._connection = self._connect(isolation_level=None, check_same_thread=False)
+        for statement in SCHEMA:
+            self._connection.execute(statement)
+
+    def _connect(self, **kwargs):
+        connection = sqlite3.connect(self.path, timeout=30, **kwargs)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=FULL")
+        return connection
+
+    def append(self, event, body, delivery_id=None, headers=None, wait=True, timeout=None):
+        """Spools a delivery and returns its offset, or a future of it when ``wait`` is false.
+
+        Raises ``OctokitTimeoutError`` when the delivery is not on disk within ``timeout`` seconds; it may still be
+        written afterwards.
+        """
+        row = (delivery_id, event, json.dumps(headers or {}, sort_keys=True), bytes(body), self.clock())
+        future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._start_writer()
+            self._queue.put((row, future))
+        if not wait:
+            return future
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            raise errors.OctokitTimeoutError("delivery was not spooled within {}s".format(timeout)) from None
+
+    def _start_writer(self):
+        if self._closed:
+            raise ValueError("the spool is closed")
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write, name="octokit-spool", daemon=True)
+            self._writer.start()
+
+    def _write(self):
+        try:
+            with closing(self._connect(check_same_thread=False)) as connection:
+                batch = self._next_batch()
+                while batch is not None:
+                    self._commit(connection, batch)
+                    batch = self._next_batch()
+        except Exception as error:
+            self._fail_pending(error)
+
+    def _fail_pending(self, error):
+        with self._lock:
+            self._writer = None
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    item[1].set_exception(error)
+
+    def _next_batch(self):
+        item = self._queue.get()
+        batch = [item] if item is not None else None
+        while batch and len(batch) < self.batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _commit(self, connection, batch):
+        insert = "INSERT INTO deliveries (delivery_id, event, headers, body, received) VALUES (?, ?, ?, ?, ?)"
+        try:
+            with connection:
+                offsets = [connection.execute(insert, row).lastrowid for row, future in batch]
+        except Exception as error:
+            for row, future in batch:
+                future.set_exception(error)
+            return
+        for (row, future), offset in zip(batch, offsets):
+            future.set_result(offset)
+
+    def read(self, offset=1, limit=100):
+        """Returns up to ``limit`` deliveries starting at ``offset``."""
+        query = "SELECT * FROM deliveries WHERE offset >= ? ORDER BY offset LIMIT ?"
+        with self._lock:
+            rows = self._connection.execute(query, (offset, limit)).fetchall()
+        return [SpooledDelivery(o, d, e, json.loads(h), b, r) for o, d, e, h, b, r in rows]
+
+    def committed(self, name):
+        with self._lock:
+            row = self._connection.execute("SELECT offset FROM consumers WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else 0
+
+    def commit(self, name, offset):
+        query = "INSERT INTO consumers (name, offset) VALUES (?, ?) ON CONFLICT (name) DO UPDATE SET offset = ?"
+        with self._lock:
+            self._connection.execute(query, (name, offset, offset))
+
+    def truncate(self, offset):
+        """Deletes the deliveries before ``offset``."""
+        with self._lock:
+            self._connection.execute("DELETE FROM deliveries WHERE offset < ?", (offset,))
+
+    def close(self):
+        """Writes the deliveries already queued and closes the spool; ``append`` raises ``ValueError`` afterwards."""
+        with self._lock:
+            self._closed, writer = True, self._writer
+            if writer is not None:
+                self._queue.put(None)
+        if writer is not None:
+            writer.join()
+        with self._lock:
+            self._writer = None
+            self._connection.close()
+
+
+class SpoolConsumer(object):
+    """Reads a spool in batches with at-least-once semantics.
+
+    The offset of consumer ``name`` is stored in the spool and only moves past a batch once every delivery in it
+    was handled, so deliveries handled before a crash are handled again. ``seek`` replays from any offset.
+    """
+
+    def __init__(self, spool, name="default", batch_size=100):
+        self.spool = spool
+        self.name = name
+        self.batch_size = batch_size
+
+    @property
+    def offset(self):
+        """The offset of the next delivery to handle."""
+        return self.spool.committed(self.name) + 1
+
+    def poll(self):
+        return self.spool.read(self.offset, self.batch_size)
+
+    def commit(self, delivery):
+        self.spool.commit(self.name, delivery.offset)
+
+    def seek(self, offset):
+        self.spool.commit(self.name, offset - 1)
+
+    def drain(self, handler):
+        """Hands every delivery after the committed offset to ``handler`` and returns how many were handled."""
+        handled, batch = 0, self.poll()
+        while batch:
+            for delivery in batch:
+                handler(delivery)
+            self.commit(batch[-1])
+            handled += len(batch)
+            batch = self.poll()
+        return handled
@@ -0,0 +1,26 @@
+import re
+from urllib.parse import quote
+
+variable_regex = re.compile(r"\{(\w+)\}")
+
+
+class URLTemplate(object):
+    """A route path such as ``/repos/{owner}/{repo}`` parsed once into literal segments and variable slots."""
+
+    __slots__ = ("template", "literals", "names")
+
+    def __init__(self, template):
+        parts = variable_regex.split(template)
+        self.template = template
+        self.literals = tuple(parts[0::2])
+        self.names = tuple(parts[1::2])
+
+    def __repr__(self):
+        return "URLTemplate({!r})".format(self.template)
+
+    def expand(self, values):
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            parts.append(quote(str(values[name]), safe="") if name in values else "{%s}" % name)
+            parts.append(literal)
+        return "".join(parts)
@@ -0,0 +1,212 @@
+import datetime
+import heapq
+import threading
+import time
+from collections import defaultdict
+from collections import namedtuple
+
+from jose import jwk
+from jose import jwt
+
+from octokit.transport import get_default_transport
+
+InstallationToken = namedtuple("InstallationToken", ["token", "expires_at", "expires"])
+
+JWT_LIFETIME = 9 * 60
+JWT_REFRESH_MARGIN = 60
+TOKEN_LIFETIME = 60 * 60
+
+_token_managers = {}
+_token_managers_lock = threading.Lock()
+_signing_keys = {}
+_app_jwts = {}
+
+
+def get_token_manager(app_id, private_key, base_url="https://api.github.com"):
+    key = (base_url, str(app_id), private_key)
+    with _token_managers_lock:
+        if key not in _token_managers:
+            _token_managers[key] = InstallationTokenManager(app_id, private_key, base_url=base_url)
+        return _token_managers[key]
+
+
+def signing_key(private_key):
+    if private_key not in _signing_keys:
+        _signing_keys[private_key] = jwk.construct(private_key, "RS256")
+    return _signing_keys[private_key]
+
+
+def app_jwt(app_id, private_key, clock=time.time):
+    """Returns a JWT for the app, signing a new one only when the cached one is about to expire."""
+    now = int(clock())
+    cached = _app_jwts.get((app_id, private_key))
+    if cached is not None and cached[1] - JWT_REFRESH_MARGIN > now:
+        return cached[0]
+    payload = {"iat": now, "exp": now + JWT_LIFETIME, "iss": app_id}
+    token = jwt.encode(payload, signing_key(private_key), algorithm="RS256")
+    _app_jwts[(app_id, private_key)] = token, payload["exp"]
+    return token
+
+
+def parse_timestamp(value):
+    parsed = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    return parsed.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+class InstallationTokenManager(object):
+    """Fetches the installation access tokens of one GitHub App and caches them per installation.
+
+    Tokens of installations used within the last hour are refreshed by one background thread ``refresh_margin``
+    seconds before they expire; other tokens, and tokens already inside the margin, are refreshed by the caller.
+    ``get_token_manager`` returns the manager shared by every client of the same app.
+    """
+
+    def __init__(
+        self,
+        app_id,
+        private_key,
+        transport=None,
+        base_url="https://api.github.com",
+        refresh_margin=300,
+        background=True,
+        timeout=10,
+        clock=time.time,
+    ):
+        self.app_id = app_id
+        self.private_key = private_key
+        self.transport = transport or get_default_transport()
+        self.base_url = base_url
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self.timeout = timeout
+        self.clock = clock
+        self._tokens = {}
+        self._installations = {}
+        self._last_used = {}
+        self._transports = {}
+        self._due = []
+        self._scheduler = None
+        self._condition = threading.Condition()
+        self._locks = defaultdict(threading.Lock)
+
+    def headers(self):
+        return {
+            "Authorization": "Bearer {}".format(app_jwt(self.app_id, self.private_key)),
+            "Accept": "application/vnd.github.machine-man-preview+json",
+        }
+
+    def installation_path(self, owner=None, repo=None, org=None):
+        if owner is not None and repo is not None:
+            return "/repos/{}/{}/installation".format(owner, repo)
+        if org is not None:
+            return "/orgs/{}/installation".format(org)
+        if owner is not None:
+            return "/users/{}/installation".format(owner)
+        return "/app/installations"
+
+    def request_options(self, timeout=None):
+        return {"headers": self.headers(), "timeout": timeout or self.timeout}
+
+    def installation_id(self, owner=None, repo=None, org=None, transport=None, timeout=None):
+        path = self.installation_path(owner, repo, org)
+        if path not in self._installations:
+            transport = transport or self.transport
+            response = transport.request("get", self.base_url + path, **self.request_options(timeout))
+            self.set_installation(path, response.json())
+        return self._installations[path]
+
+    def cached_installation_id(self, path):
+        return self._installations.get(path)
+
+    def set_installation(self, path, data):
+        if isinstance(data, list):
+            data = [x for x in data if str(x.get("app_id")) == str(self.app_id)].pop()
+        self._installations[path] = data["id"]
+        return data["id"]
+
+    def access_tokens_url(self, installation_id):
+        return "{}/app/installations/{}/access_tokens".format(self.base_url, installation_id)
+
+    def cached(self, installation_id):
+        self._last_used[installation_id] = self.clock()
+        token = self._tokens.get(installation_id)
+        if token is not None and token.expires - self.refresh_margin > self.clock():
+            return token
+        return None
+
+    def get(self, installation_id, transport=None, timeout=None):
+        """Returns a valid token, fetched through the caller's ``transport``, which background refreshes reuse."""
+        if transport is not None:
+            self._transports[installation_id] = transport, timeout
+        token = self.cached(installation_id)
+        if token is None:
+            with self._locks[installation_id]:
+                token = self.cached(installation_id) or self.refresh(installation_id, transport, timeout)
+        return token
+
+    def refresh(self, installation_id, transport=None, timeout=None):
+        if transport is None:
+            transport, timeout = self._transports.get(installation_id, (self.transport, timeout))
+        url = self.access_tokens_url(installation_id)
+        return self.store(installation_id, transport.request("post", url, **self.request_options(timeout)).json())
+
+    def store(self, installation_id, data):
+        token = InstallationToken(data["token"], data["expires_at"], parse_timestamp(data["expires_at"]))
+        self._tokens[installation_id] = token
+        self._schedule_refresh(installation_id, token)
+        return token
+
+    def invalidate(self, installation_id):
+        self._tokens.pop(installation_id, None)
+
+    def close(self):
+        """Stops the background refreshes; the next refresh scheduled starts them again."""
+        with self._condition:
+            self._scheduler = None
+            self._due = []
+            self._condition.notify()
+
+    def _schedule_refresh(self, installation_id, token):
+        due = token.expires - self.refresh_margin
+        if not self.background or due <= self.clock():
+            return
+        with self._condition:
+            heapq.heappush(self._due, (due, str(installation_id), installation_id, token))
+            if self._scheduler is None:
+                self._scheduler = threading.Thread(target=self._run_scheduler, name="octokit-tokens", daemon=True)
+                self._scheduler.start()
+            self._condition.notify()
+
+    def _run_scheduler(self):
+        while True:
+            with self._condition:
+                due = self._next_due()
+                if due is False:
+                    return
+            if due is not None:
+                self._refresh_due(*due)
+
+    def _next_due(self):
+        """Waits for the next refresh that is due; returns ``False`` once the scheduler was stopped."""
+        if self._scheduler is not threading.current_thread():
+            return False
+        if not self._due:
+            self._condition.wait()
+            return None
+        delay = self._due[0][0] - self.clock()
+        if delay > 0:
+            self._condition.wait(delay)
+            return None
+        return heapq.heappop(self._due)[2:]
+
+    def _refresh_due(self, installation_id, token):
+        if self.clock() - self._last_used.get(installation_id, float("-inf")) > TOKEN_LIFETIME:
+            return
+        with self._locks[installation_id]:
+            if self._tokens.get(installation_id) is not token:
+                return
+            try:
+                self.refresh(installation_id)
+            except Exception:
+                # The next get() refreshes in the calling thread and raises the error there.
+                pass
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+TRANSPORT_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if httpx is not None else ())
+TRANSPORT_OPTIONS = ("pool_connections", "pool_maxsize", "pool_block", "keep_alive")
+ASYNC_TRANSPORT_OPTIONS = ("max_connections", "max_keepalive_connections", "keepalive_expiry")
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+_default_async_transports = weakref.WeakKeyDictionary()
+
+
+def get_default_transport():
+    global _default_transport
+    if _default_transport is None:
+        with _default_transport_lock:
+            if _default_transport is None:
+                _default_transport = Transport()
+    return _default_transport
+
+
+def get_default_async_transport():
+    loop = asyncio.get_event_loop()
+    transport = _default_async_transports.get(loop)
+    if transport is None:
+        transport = _default_async_transports[loop] = AsyncTransport()
+    return transport
+
+
+class Transport(object):
+    """Persistent HTTP session shared by the generated methods and the authentication flows.
+
+    ``pool_connections`` is the number of hosts to keep connection pools for and ``pool_maxsize`` the number of
+    connections kept alive per host. With ``pool_block`` set, ``pool_maxsize`` is also the maximum number of
+    concurrent connections per host. A ``session`` passed in keeps its own adapters, with their retries, proxies and
+    certificates, and the pool options are ignored.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, pool_block=False, keep_alive=True, session=None):
+        self.session = session
+        if session is None:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+        if not keep_alive:
+            self.session.headers["Connection"] = "close"
+
+    def request(self, method, url, **kwargs):
+        return getattr(self.session, method)(url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncTransport(object):
+    """Pooled asynchronous HTTP client used by ``AsyncOctokit``; requires ``httpx``.
+
+    ``max_connections`` bounds the number of concurrent connections and ``max_keepalive_connections`` the number of
+    idle connections kept open for ``keepalive_expiry`` seconds.
+    """
+
+    def __init__(self, max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0, client=None):
+        if httpx is None:
+            raise ImportError("AsyncOctokit requires httpx; install octokitpy[async]")
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client = client or httpx.AsyncClient(limits=limits)
+
+    async def request(self, method, url, **kwargs):
+        if "data" in kwargs:
+            kwargs["content"] = kwargs.pop("data")
+        if isinstance(kwargs.get("timeout"), tuple):
+            connect, read = kwargs["timeout"]
+            kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+        return await self.client.request(method.upper(), url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
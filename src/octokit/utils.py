@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 import re
@@ -15,3 +16,9 @@ def get_json_data(filename):
 
 def parameter_transform(params):
     return {param["name"]: param for param in params}
+
+
+def auth_identity(requests_kwargs):
+    headers = requests_kwargs.get("headers", {})
+    credentials = repr((headers.get("Authorization"), requests_kwargs.get("auth")))
+    return hashlib.sha256(credentials.encode("utf-8")).hexdigest()
@@ -0,0 +1,82 @@
+from octokit import errors
+
+VALIDATION_MODES = ("off", "fast", "strict")
+
+schema_types = {"array": list, "object": dict, "string": str}
+
+
+class SchemaValidator(object):
+    """A request body schema compiled into a callable.
+
+    With ``nested`` unset only the top level of the data is checked: required properties, enums and its type.
+    """
+
+    __slots__ = ("type", "python_type", "required", "enums", "properties", "items", "items_required", "nested")
+
+    def __init__(self, schema, nested=True):
+        self.type = schema.get("type")
+        self.python_type = schema_types.get(self.type)
+        self.required = tuple(schema.get("required") or ()) if self.type == "object" else ()
+        self.enums = {
+            name: (frozenset(p["enum"]), p["enum"]) for name, p in self._properties(schema).items() if p.get("enum")
+        }
+        self.nested = nested
+        self.properties = {}
+        self.items = self
+        self.items_required = bool(schema.get("items", {}).get("required"))
+        if nested:
+            self.properties = {name: SchemaValidator(p) for name, p in self._properties(schema).items()}
+            self.items = SchemaValidator(schema["items"]) if schema.get("items") else self
+
+    def _properties(self, schema):
+        return schema.get("properties") or {}
+
+    def __call__(self, value):
+        if isinstance(value, list):
+            self._validate_list(value)
+        if isinstance(value, dict):
+            self._validate_dict(value)
+        self._validate_required(value)
+        self._validate_type(value)
+        return True
+
+    def _validate_list(self, value):
+        if not value and self.items_required:
+            raise errors.OctokitParameterError("property is missing required items")
+        if self.nested:
+            for item in value:
+                self.items(item)
+
+    def _validate_dict(self, value):
+        for name, item in value.items():
+            if name in self.enums:
+                self._validate_enum(name, item)
+            if name in self.properties and isinstance(item, (dict, list)):
+                self.properties[name](item)
+
+    def _validate_enum(self, name, value):
+        options, enum = self.enums[name]
+        try:
+            valid = value in options
+        except TypeError:
+            valid = False
+        if not valid:
+            message = "{} is not a valid option for {}; must be one of {}".format(value, name, enum)
+            raise errors.OctokitParameterError(message)
+
+    def _validate_required(self, value):
+        for name in self.required:
+            if name not in value:
+                raise errors.OctokitParameterError("{} is a required parameter".format(name))
+            if value[name] is None:
+                raise errors.OctokitParameterError("{} must have a value".format(name))
+
+    def _validate_type(self, value):
+        if self.python_type is not None and not isinstance(value, self.python_type):
+            name = value.__class__.__name__
+            message = f"{name} type does not match the schema type of {self.type} for the data of {value}"
+            raise errors.OctokitParameterError(message)
+
+
+def compile_validators(schema):
+    return {"fast": SchemaValidator(schema or {}, nested=False), "strict": SchemaValidator(schema or {})}
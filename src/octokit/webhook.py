@@ -1,16 +1,62 @@
 import hashlib
 import hmac
-import json
 from uuid import UUID
 
 from octokit_routes import webhook_names
 
+from octokit.payload import PayloadView
+
+SIGNATURE_HEADERS = ("X-Hub-Signature-256", "X-Hub-Signature")
+DIGESTS = {"sha256": hashlib.sha256, "sha1": hashlib.sha1}
+
+# Webhook names include the action, e.g. "pull_request.opened"; X-GitHub-Event only carries the event.
+event_names = frozenset(webhook_names) | frozenset(name.split(".")[0] for name in webhook_names)
+
+
+def as_bytes(value):
+    return value.encode("utf-8") if isinstance(value, str) else value
+
+
+def get_signature(headers):
+    """Returns the algorithm and hex digest of the strongest signature header, or ``None``."""
+    for header in SIGNATURE_HEADERS:
+        algorithm, _, signature = (headers.get(header) or "").partition("=")
+        if signature:
+            return algorithm, signature
+    return None
+
+
+class SignatureVerifier(object):
+    """Verifies webhook signatures with a secret that is keyed once per algorithm.
+
+    Every delivery starts from a copy of the keyed HMAC state. Payloads can be ``str``, ``bytes``, ``bytearray`` or
+    ``memoryview``; only ``str`` is encoded.
+    """
+
+    def __init__(self, secret):
+        self.key = as_bytes(secret)
+        self._hmacs = {}
+
+    def hmac(self, algorithm):
+        if algorithm not in self._hmacs:
+            self._hmacs[algorithm] = hmac.new(self.key, digestmod=DIGESTS[algorithm])
+        return self._hmacs[algorithm].copy()
+
+    def verify(self, headers, payload):
+        signature = get_signature(headers)
+        if signature is None or signature[0] not in DIGESTS:
+            return False
+        mac = self.hmac(signature[0])
+        mac.update(as_bytes(payload))
+        return self.matches(mac, signature[1])
+
+    def matches(self, mac, signature):
+        return hmac.compare_digest(as_bytes(signature), mac.hexdigest().encode("utf-8"))
+
 
 def valid_signature(headers, payload, secret):
-    encoding = "utf-8"
-    algo, sig = headers.get("X-Hub-Signature").split("=")
-    digest = hmac.new(secret.encode(encoding), payload.encode(encoding), getattr(hashlib, algo)).hexdigest()
-    return hmac.compare_digest(sig.encode(encoding), digest.encode(encoding))
+    verifier = secret if isinstance(secret, SignatureVerifier) else SignatureVerifier(secret)
+    return verifier.verify(headers, payload)
 
 
 def valid_guid(guid):
@@ -21,7 +67,7 @@ def valid_guid(guid):
 
 
 def valid_event(event, events):
-    return event in webhook_names
+    return event in event_names
 
 
 def valid_user_agent(ua):
@@ -41,7 +87,7 @@ def valid_headers(headers, events, verify_user_agent):
 def verify(headers, payload, secret, events=None, verify_user_agent=False, return_app_id=False):
     if not valid_headers(headers, events, verify_user_agent):
         return False
-    validity = valid_signature(headers, payload, secret)
+    validity = valid_signature(headers, payload.body if isinstance(payload, PayloadView) else payload, secret)
     if validity and return_app_id and headers.get("X-GitHub-Event") == "ping":
-        return json.loads(payload).get("hook").get("app_id")
+        return (payload if isinstance(payload, PayloadView) else PayloadView(payload)).get("hook.app_id")
     return validity
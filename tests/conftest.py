@@ -0,0 +1,19 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class Clock(object):
+    def __init__(self, now=1000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_response(status_code=200, content=b"{}", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.url = "https://api.github.com/repos/octokit/octokit.py"
+    return response
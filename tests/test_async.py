@@ -0,0 +1,197 @@
+import asyncio
+import inspect
+import json
+import os
+
+import pytest
+
+from octokit import AsyncOctokit
+from octokit.graphql import AsyncGraphQLBatch
+from octokit.retry import RetryPolicy
+from octokit.tokens import InstallationTokenManager
+from octokit.transport import AsyncTransport
+
+httpx = pytest.importorskip("httpx")
+
+
+def mock_transport(handler):
+    return AsyncTransport(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+
+class AsyncMockResponse(object):
+    def __init__(self, page, link):
+        self._response = httpx.Response(200, headers={"Link": link})
+        self.json = page
+
+
+class TestAsyncOctokit(object):
+    def test_methods_are_coroutine_functions_with_the_same_names(self):
+        sut = AsyncOctokit()
+        assert inspect.iscoroutinefunction(sut.issues.create)
+        assert sut.issues.create.__name__ == "create"
+        assert sut.oauth_authorizations.list_your_grants.__name__ == "list_your_grants"
+        assert sut.issues.create.__doc__
+
+    def test_can_make_a_request(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json={"id": 1, "user": {"login": "octocat"}})
+
+        async def run():
+            octokit = AsyncOctokit(auth="token", token="yak", transport=mock_transport(handler))
+            return await octokit.issues.update(owner="testUser", repo="testRepo", issue_number=1, state="closed")
+
+        sut = asyncio.run(run())
+        assert sut.json == {"id": 1, "user": {"login": "octocat"}}
+        assert sut.response.user.login == "octocat"
+        assert str(requests[0].url) == "https://api.github.com/repos/testUser/testRepo/issues/1"
+        assert requests[0].method == "PATCH"
+        assert requests[0].headers["Authorization"] == "token yak"
+        assert json.loads(requests[0].content) == {"state": "closed"}
+
+    def test_query_parameters_are_sent_for_get_requests(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[])
+
+        async def run():
+            octokit = AsyncOctokit(transport=mock_transport(handler))
+            await octokit.users.list_followers_for_user(username="octokit")
+
+        asyncio.run(run())
+        assert requests[0].url.path == "/users/octokit/followers"
+        assert dict(requests[0].url.params) == {"page": "1", "per_page": "30"}
+
+    def test_paginate(self):
+        def handler(request):
+            page = int(request.url.params["page"])
+            link = '<https://api.github.com/user/repos?page={}>; rel="next", <https://api.github.com/user/repos?page=3>; rel="last"'.format(  # noqa E501
+                min(page + 1, 3)
+            )
+            return httpx.Response(200, json=[page], headers={"Link": link})
+
+        async def run():
+            octokit = AsyncOctokit(transport=mock_transport(handler))
+            return [page async for page in octokit.paginate(octokit.repos.list_for_authenticated_user)]
+
+        assert asyncio.run(run()) == [[1], [2], [3]]
+
+    def test_concurrent_paginate(self):
+        in_flight = []
+
+        async def sut_obj(page=None):
+            in_flight.append(page)
+            await asyncio.sleep(0.01 * (5 - page))
+            link = '<https://api.github.com/user/repos?page={}>; rel="next", <https://api.github.com/user/repos?page=5>; rel="last"'.format(  # noqa E501
+                min(page + 1, 5)
+            )
+            return AsyncMockResponse(page, link)
+
+        async def run():
+            return [page async for page in AsyncOctokit().paginate(sut_obj, concurrency=2)]
+
+        assert asyncio.run(run()) == [1, 2, 3, 4, 5]
+        assert sorted(in_flight) == [1, 2, 3, 4, 5]
+
+    def test_paginate_items(self):
+        async def sut_obj(page=None):
+            await asyncio.sleep(0.01 * (5 - page))
+            link = '<https://api.github.com/user/repos?page={}>; rel="next", <https://api.github.com/user/repos?page=5>; rel="last"'.format(  # noqa E501
+                min(page + 1, 5)
+            )
+            return AsyncMockResponse({"total_count": 10, "check_runs": [page, -page]}, link)
+
+        async def run():
+            return [item async for item in AsyncOctokit().paginate_items(sut_obj, lookahead=3)]
+
+        assert asyncio.run(run()) == [1, -1, 2, -2, 3, -3, 4, -4, 5, -5]
+
+    def test_transient_failures_are_retried(self, mocker):
+        mocker.patch("random.uniform", return_value=0)
+        responses = [httpx.Response(503), httpx.Response(200, json={"id": 1})]
+
+        async def run():
+            octokit = AsyncOctokit(transport=mock_transport(lambda request: responses.pop(0)), retry=RetryPolicy())
+            return await octokit.repos.get(owner="octokit", repo="octokit.py")
+
+        assert asyncio.run(run()).json == {"id": 1}
+        assert responses == []
+
+    def test_batch_limits_requests_in_flight(self):
+        in_flight, peak = [], []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return httpx.Response(200, json={"path": request.url.path})
+
+        async def run():
+            octokit = AsyncOctokit(transport=mock_transport(handler))
+            calls = [("repos", "get", {"owner": "octokit", "repo": "repo{}".format(i)}) for i in range(6)]
+            calls.append(("repos", "get", {"owner": "octokit"}))
+            return await octokit.batch(calls, concurrency=2)
+
+        results = asyncio.run(run())
+        assert [r.json["path"] for r in results[:6]] == ["/repos/octokit/repo{}".format(i) for i in range(6)]
+        assert isinstance(results[6], Exception)
+        assert max(peak) == 2
+
+    def test_graphql_batch(self):
+        documents = []
+
+        def handler(request):
+            documents.append(json.loads(request.content)["query"])
+            return httpx.Response(200, json={"data": {"q0": {"login": "octocat"}, "q1": {"login": "hubot"}}})
+
+        async def run():
+            sut = AsyncGraphQLBatch(AsyncOctokit(transport=mock_transport(handler)))
+            sut.add("user(login: $login) { login }", login="octocat")
+            sut.add("user(login: $login) { login }", login="hubot")
+            return await sut.execute()
+
+        assert asyncio.run(run()) == [{"login": "octocat"}, {"login": "hubot"}]
+        assert documents == ['query {\n  q0: user(login: "octocat") { login }\n  q1: user(login: "hubot") { login }\n}']
+
+    def test_installation_token_is_fetched_once_before_the_first_call(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.url.path == "/app/installations":
+                return httpx.Response(200, json=[{"id": 13, "app_id": 1}, {"id": 37, "app_id": 42}])
+            if request.url.path == "/app/installations/37/access_tokens":
+                return httpx.Response(200, json={"token": "v1.1f699f1069f60", "expires_at": "2099-07-11T22:14:10Z"})
+            return httpx.Response(200, json={})
+
+        with open(os.path.join(os.path.dirname(__file__), "test.pem"), "r") as f:
+            private_key = f.read()
+        manager = InstallationTokenManager("42", private_key, background=False)
+
+        async def run():
+            octokit = AsyncOctokit(
+                auth="installation",
+                app_id="42",
+                private_key=private_key,
+                token_manager=manager,
+                transport=mock_transport(handler),
+            )
+            assert octokit.token is None
+            await asyncio.gather(*[octokit.apps.list_repos() for _ in range(3)])
+            return octokit
+
+        sut = asyncio.run(run())
+        assert sut.token == "v1.1f699f1069f60"
+        assert sut.installation_id == 37
+        assert [r.url.path for r in requests].count("/app/installations/37/access_tokens") == 1
+        assert requests[-1].headers["Authorization"] == "token v1.1f699f1069f60"
+
+    def test_pool_options_create_a_private_transport(self):
+        sut = AsyncOctokit(max_connections=500, max_keepalive_connections=50)
+        assert isinstance(sut.transport, AsyncTransport)
+        assert AsyncOctokit().transport is None
@@ -0,0 +1,82 @@
+from conftest import make_response
+from octokit import Octokit
+from octokit.cache import LRUStorage
+from octokit.cache import ResponseCache
+
+
+class TestLRUStorage(object):
+    def test_least_recently_used_entries_are_evicted(self):
+        sut = LRUStorage(maxsize=2)
+        sut.set("a", 1)
+        sut.set("b", 2)
+        sut.get("a")
+        sut.set("c", 3)
+        assert sut.get("a") == 1
+        assert sut.get("b") is None
+        assert sut.get("c") == 3
+        assert len(sut) == 2
+
+    def test_delete(self):
+        sut = LRUStorage()
+        sut.set("a", 1)
+        sut.delete("a")
+        sut.delete("missing")
+        assert sut.get("a") is None
+
+
+class TestResponseCache(object):
+    def test_sends_if_none_match_and_serves_cached_body_on_not_modified(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        get.return_value = make_response(200, b'{"id": 1}', {"ETag": '"abc"', "X-RateLimit-Remaining": "4999"})
+        octokit = Octokit(auth="token", token="yak", cache=ResponseCache())
+        first = octokit.repos.get(owner="octokit", repo="octokit.py")
+        assert "If-None-Match" not in get.call_args[1]["headers"]
+        get.return_value = make_response(304, headers={"ETag": '"abc"', "X-RateLimit-Remaining": "4998"})
+        second = octokit.repos.get(owner="octokit", repo="octokit.py")
+        assert get.call_args[1]["headers"]["If-None-Match"] == '"abc"'
+        assert first.json == second.json == {"id": 1}
+        assert second.response.id == 1
+        assert second._response.from_cache
+        assert second._response.headers["X-RateLimit-Remaining"] == "4998"
+
+    def test_sends_if_modified_since(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        last_modified = "Thu, 05 Jul 2012 15:31:30 GMT"
+        get.return_value = make_response(200, b"[]", {"Last-Modified": last_modified})
+        octokit = Octokit(cache=ResponseCache())
+        octokit.repos.get(owner="octokit", repo="octokit.py")
+        octokit.repos.get(owner="octokit", repo="octokit.py")
+        assert get.call_args[1]["headers"]["If-Modified-Since"] == last_modified
+
+    def test_entries_are_keyed_by_identity_and_parameters(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        get.return_value = make_response(200, b"{}", {"ETag": '"abc"'})
+        cache = ResponseCache()
+        Octokit(auth="token", token="yak", cache=cache).repos.get(owner="octokit", repo="octokit.py")
+        Octokit(auth="token", token="other", cache=cache).repos.get(owner="octokit", repo="octokit.py")
+        assert "If-None-Match" not in get.call_args[1]["headers"]
+        Octokit(auth="token", token="yak", cache=cache).repos.get(owner="octokit", repo="other")
+        assert "If-None-Match" not in get.call_args[1]["headers"]
+        assert len(cache.storage) == 3
+
+    def test_responses_without_validators_are_not_stored(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        get.return_value = make_response(200, b"{}")
+        cache = ResponseCache()
+        Octokit(cache=cache).repos.get(owner="octokit", repo="octokit.py")
+        assert len(cache.storage) == 0
+
+    def test_only_get_requests_are_cached(self, mocker):
+        patch = mocker.patch("requests.Session.patch")
+        patch.return_value = make_response(200, b"{}", {"ETag": '"abc"'})
+        cache = ResponseCache()
+        Octokit(cache=cache).issues.update(owner="octokit", repo="octokit.py", issue_number=1)
+        assert len(cache.storage) == 0
+
+    def test_storage_is_pluggable(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        get.return_value = make_response(200, b"{}", {"ETag": '"abc"'})
+        storage = {}
+        storage_backend = mocker.Mock(get=storage.get, set=storage.__setitem__)
+        Octokit(cache=ResponseCache(storage=storage_backend)).repos.get(owner="octokit", repo="octokit.py")
+        assert list(storage.values())[0]["etag"] == '"abc"'
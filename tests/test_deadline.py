@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+import requests
+
+from conftest import Clock
+from conftest import make_response
+from octokit import AsyncOctokit
+from octokit import Octokit
+from octokit import errors
+from octokit.deadline import Deadline
+from octokit.retry import RetryPolicy
+from octokit.transport import AsyncTransport
+
+
+class TestDeadline(object):
+    def test_timeout_is_capped_by_the_remaining_time(self):
+        clock = Clock(0)
+        sut = Deadline(10, clock=clock)
+        clock.now = 4
+        assert sut.timeout() == 6
+        assert sut.timeout(2) == 2
+        assert sut.timeout((3, 30)) == (3, 6)
+        assert sut.timeout((3.05, None)) == (3.05, 6)
+
+    def test_expired_deadlines_raise(self):
+        clock = Clock(0)
+        sut = Deadline(10, clock=clock)
+        clock.now = 10
+        with pytest.raises(errors.OctokitTimeoutError) as e:
+            sut.timeout()
+        assert "deadline of 10s exceeded" == str(e.value)
+
+
+class TestClientTimeouts(object):
+    def test_client_timeout_is_passed_to_requests(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        Octokit(timeout=(3.05, 27)).repos.get(owner="octokit", repo="octokit.py")
+        assert get.call_args[1]["timeout"] == (3.05, 27)
+
+    def test_per_call_timeout_overrides_the_client_timeout(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        Octokit(timeout=30).repos.get(owner="octokit", repo="octokit.py", timeout=5)
+        assert get.call_args[1]["timeout"] == 5
+
+    def test_deadline_caps_the_request_timeout(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        Octokit(timeout=30).repos.get(owner="octokit", repo="octokit.py", deadline=2)
+        assert 0 < get.call_args[1]["timeout"] <= 2
+
+    def test_expired_deadline_is_not_sent(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        clock = Clock(0)
+        deadline = Deadline(1, clock=clock)
+        clock.now = 2
+        with pytest.raises(errors.OctokitTimeoutError):
+            Octokit().repos.get(owner="octokit", repo="octokit.py", deadline=deadline)
+        assert not get.called
+
+    def test_timeouts_past_the_deadline_raise_a_timeout_error(self, mocker):
+        clock = Clock(0)
+        deadline = Deadline(1, clock=clock)
+
+        def timeout(*args, **kwargs):
+            clock.now = 1
+            raise requests.ReadTimeout()
+
+        mocker.patch("requests.Session.get", side_effect=timeout)
+        with pytest.raises(errors.OctokitTimeoutError):
+            Octokit().repos.get(owner="octokit", repo="octokit.py", deadline=deadline)
+
+    def test_retries_stop_at_the_deadline(self, mocker):
+        mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        sleep = mocker.patch("time.sleep")
+        get = mocker.patch("requests.Session.get", return_value=make_response(503))
+        retry = RetryPolicy(max_attempts=5, backoff=1)
+        sut = Octokit(retry=retry).repos.get(owner="octokit", repo="octokit.py", deadline=1.5)
+        assert sut._response.status_code == 503
+        assert get.call_count == 2
+        assert sleep.call_count == 1
+
+    def test_paginate_shares_one_deadline(self):
+        deadlines = []
+
+        def sut_obj(page=None, deadline=None):
+            deadlines.append(deadline)
+            link = '<https://api.github.com/user/repos?page={}>; rel="next", <https://api.github.com/user/repos?page=2>; rel="last"'.format(  # noqa E501
+                page + 1
+            )
+            response = make_response()
+            response.headers["Link"] = link
+            result = Octokit()._create_result(response, {})
+            return result
+
+        list(Octokit().paginate(sut_obj, deadline=60))
+        assert len(deadlines) == 2
+        assert deadlines[0] is deadlines[1]
+        assert isinstance(deadlines[0], Deadline)
+
+    def test_async_requests_are_cancelled_at_the_deadline(self):
+        httpx = pytest.importorskip("httpx")
+
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={})
+
+        async def run():
+            transport = AsyncTransport(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            await AsyncOctokit(transport=transport).repos.get(owner="octokit", repo="octokit.py", deadline=0.05)
+
+        with pytest.raises(errors.OctokitTimeoutError):
+            asyncio.run(run())
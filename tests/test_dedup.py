@@ -0,0 +1,193 @@
+import asyncio
+import multiprocessing
+import threading
+
+import pytest
+
+from conftest import Clock
+from octokit import errors
+from octokit.dedup import MemoryDeliveryStore
+from octokit.dedup import SQLiteDeliveryStore
+from octokit.dispatch import AsyncDispatcher
+from octokit.dispatch import Dispatcher
+from octokit.middleware import AsyncWebhookMiddleware
+from octokit.middleware import WebhookMiddleware
+from test_middleware import WSGIApp
+from test_middleware import call_wsgi
+from test_middleware import environ
+from test_middleware import payload
+from test_middleware import signed_headers
+
+
+def add_deliveries(path, ids, results):
+    store = SQLiteDeliveryStore(path)
+    results.extend([delivery_id for delivery_id in ids if store.add(delivery_id)])
+    store.close()
+
+
+class TestMemoryDeliveryStore(object):
+    def test_deliveries_are_only_new_once(self):
+        sut = MemoryDeliveryStore()
+        assert sut.add("a")
+        assert not sut.add("a")
+        assert "a" in sut
+        sut.discard("a")
+        assert sut.add("a")
+
+    def test_deliveries_expire(self):
+        clock = Clock()
+        sut = MemoryDeliveryStore(ttl=60, clock=clock)
+        sut.add("a")
+        clock.now += 30
+        sut.add("b")
+        clock.now += 30
+        assert "a" not in sut
+        assert "b" in sut
+        assert len(sut) == 1
+        assert sut.add("a")
+
+    def test_least_recently_added_deliveries_are_evicted(self):
+        sut = MemoryDeliveryStore(maxsize=2)
+        for delivery_id in "abc":
+            sut.add(delivery_id)
+        assert len(sut) == 2
+        assert "a" not in sut
+
+
+class TestSQLiteDeliveryStore(object):
+    def test_deliveries_are_shared_between_stores(self, tmp_path):
+        first = SQLiteDeliveryStore(tmp_path / "deliveries.db")
+        second = SQLiteDeliveryStore(tmp_path / "deliveries.db")
+        assert first.add("a")
+        assert not second.add("a")
+        assert "a" in second
+        second.discard("a")
+        assert first.add("a")
+
+    def test_deliveries_expire_and_are_pruned(self, tmp_path):
+        clock = Clock()
+        sut = SQLiteDeliveryStore(tmp_path / "deliveries.db", ttl=60, prune_every=2, clock=clock)
+        sut.add("a")
+        clock.now += 60
+        assert "a" not in sut
+        assert sut.add("b")
+        assert len(sut) == 1
+        assert sut.add("a")
+
+    def test_processes_agree_on_the_first_delivery(self, tmp_path):
+        path = str(tmp_path / "deliveries.db")
+        SQLiteDeliveryStore(path).close()
+        ids = ["delivery-{}".format(i) for i in range(50)]
+        with multiprocessing.Manager() as manager:
+            results = manager.list()
+            processes = [multiprocessing.Process(target=add_deliveries, args=(path, ids, results)) for _ in range(3)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            assert sorted(results) == sorted(ids)
+
+
+class TestDeduplication(object):
+    def test_middleware_answers_duplicates_without_calling_the_app(self):
+        app = WSGIApp()
+        sut = WebhookMiddleware(app, "secret", path="/webhooks", dedup=MemoryDeliveryStore())
+        assert call_wsgi(sut, environ(signed_headers()))[0] == "200 OK"
+        assert call_wsgi(sut, environ(signed_headers())) == ("200 OK", b"OK")
+        assert len(app.calls) == 1
+
+    def test_middleware_checks_the_signature_of_known_deliveries(self):
+        store = MemoryDeliveryStore()
+        sut = WebhookMiddleware(WSGIApp(), "secret", path="/webhooks", dedup=store)
+        call_wsgi(sut, environ(signed_headers()))
+        forged = environ(signed_headers(secret=b"guess"))
+        assert call_wsgi(sut, forged)[0] == "401 Unauthorized"
+
+    def test_middleware_and_dispatcher_share_a_store(self):
+        calls = []
+        store = MemoryDeliveryStore()
+        dispatcher = Dispatcher(dedup=store)
+        dispatcher.add("pull_request", calls.append)
+
+        def app(environ, start_response):
+            delivery_id = environ["HTTP_X_GITHUB_DELIVERY"]
+            recorded = environ.get("octokit.webhook.recorded", False)
+            for future in dispatcher.dispatch("pull_request", environ["octokit.webhook.body"], delivery_id, recorded):
+                future.result()
+            start_response("200 OK", [])
+            return [b"ok"]
+
+        sut = WebhookMiddleware(app, "secret", path="/webhooks", dedup=store)
+        assert call_wsgi(sut, environ(signed_headers())) == ("200 OK", b"ok")
+        assert call_wsgi(sut, environ(signed_headers())) == ("200 OK", b"OK")
+        dispatcher.close()
+        assert len(calls) == 1
+
+    def test_dispatcher_drops_duplicates(self):
+        calls = []
+        sut = Dispatcher(dedup=MemoryDeliveryStore())
+        sut.add("push", calls.append)
+        futures = sut.dispatch("push", b"{}", "guid") + sut.dispatch("push", b"not parsed", "guid")
+        for future in futures:
+            future.result()
+        sut.close()
+        assert len(calls) == 1
+
+    def test_middleware_accepts_a_redelivery_when_the_app_raises(self):
+        def app(environ, start_response):
+            raise RuntimeError("database is down")
+
+        store = MemoryDeliveryStore()
+        sut = WebhookMiddleware(app, "secret", path="/webhooks", dedup=store)
+        with pytest.raises(RuntimeError):
+            call_wsgi(sut, environ(signed_headers()))
+        assert signed_headers()["X-GitHub-Delivery"] not in store
+
+    def test_async_middleware_accepts_a_redelivery_when_the_app_raises(self):
+        async def app(scope, receive, send):
+            raise RuntimeError("database is down")
+
+        async def receive():
+            return {"type": "http.request", "body": payload, "more_body": False}
+
+        headers = signed_headers()
+        scope = {
+            "type": "http",
+            "path": "/webhooks",
+            "method": "POST",
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        }
+        store = MemoryDeliveryStore()
+        sut = AsyncWebhookMiddleware(app, "secret", path="/webhooks", dedup=store)
+        with pytest.raises(RuntimeError):
+            asyncio.run(sut(scope, receive, None))
+        assert headers["X-GitHub-Delivery"] not in store
+
+    def test_dispatcher_accepts_a_redelivery_after_backpressure(self):
+        release = threading.Event()
+        store = MemoryDeliveryStore()
+        sut = Dispatcher(max_workers=1, max_pending=1, timeout=0, dedup=store)
+        sut.add("push", lambda event: release.wait(5))
+        busy = sut.dispatch("push", b"{}", "first")
+        with pytest.raises(errors.OctokitBackpressureError):
+            sut.dispatch("push", b"{}", "second")
+        assert "second" not in store
+        release.set()
+        busy[0].result()
+        assert len(sut.dispatch("push", b"{}", "second")) == 1
+        sut.close()
+
+    def test_async_dispatcher_accepts_a_redelivery_after_backpressure(self):
+        store = MemoryDeliveryStore()
+
+        async def run():
+            sut = AsyncDispatcher(max_pending=1, timeout=0.01, dedup=store)
+            sut.add("push", lambda event: asyncio.sleep(0.1))
+            await sut.dispatch("push", b"{}", "first")
+            with pytest.raises(errors.OctokitBackpressureError):
+                await sut.dispatch("push", b"{}", "second")
+            await sut.join()
+
+        asyncio.run(run())
+        assert "first" in store
+        assert "second" not in store
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import threading
+
+import pytest
+
+from octokit import errors
+from octokit.dispatch import AsyncDispatcher
+from octokit.dispatch import Dispatcher
+
+
+class TestDispatcher(object):
+    def test_handlers_run_for_the_event_the_action_and_all_events(self):
+        sut = Dispatcher(max_workers=2)
+        calls = []
+        sut.add("*", lambda event: calls.append(("*", event.name)))
+        sut.on("pull_request")(lambda event: calls.append(("pull_request", event.action)))
+
+        @sut.on("pull_request.opened", "issues.opened")
+        def opened(event):
+            calls.append(("opened", event.payload["number"], event.delivery_id))
+
+        futures = sut.dispatch("pull_request", json.dumps({"action": "opened", "number": 1}).encode(), "guid")
+        futures += sut.dispatch("pull_request", {"action": "closed", "number": 2})
+        futures += sut.dispatch("push", b"{}")
+        for future in futures:
+            future.result()
+        sut.close()
+        assert sorted(calls, key=str) == sorted(
+            [
+                ("*", "pull_request"),
+                ("pull_request", "opened"),
+                ("opened", 1, "guid"),
+                ("*", "pull_request"),
+                ("pull_request", "closed"),
+                ("*", "push"),
+            ],
+            key=str,
+        )
+
+    def test_handlers_are_indexed_per_event_action(self):
+        sut = Dispatcher()
+        handler = sut.on("issues.opened")(lambda event: None)
+        assert sut.handlers("issues", "opened") == (handler,)
+        assert sut._index == {"issues.opened": (handler,)}
+        assert sut.handlers("issues", "closed") == ()
+        sut.add("issues", handler)
+        assert sut._index == {}
+        assert sut.handlers("issues", "opened") == (handler, handler)
+
+    def test_unknown_events_cannot_be_registered(self):
+        with pytest.raises(ValueError):
+            Dispatcher().add("pull_requests", lambda event: None)
+
+    def test_handler_errors_are_reported(self):
+        reported = []
+        sut = Dispatcher(on_error=lambda event, handler, error: reported.append((event.name, str(error))))
+        sut.add("push", lambda event: 1 / 0)
+        future = sut.dispatch("push", {})[0]
+        with pytest.raises(ZeroDivisionError):
+            future.result()
+        assert reported == [("push", "division by zero")]
+
+    def test_dispatch_applies_backpressure(self):
+        release = threading.Event()
+        sut = Dispatcher(max_workers=1, max_pending=2, timeout=0.01)
+        sut.add("push", lambda event: release.wait(5))
+        sut.dispatch("push", {})
+        sut.dispatch("push", {})
+        with pytest.raises(errors.OctokitBackpressureError):
+            sut.dispatch("push", {})
+        release.set()
+        sut.close()
+
+    def test_dispatch_does_not_wait_for_room_by_default(self):
+        release = threading.Event()
+        sut = Dispatcher(max_workers=1, max_pending=1)
+        sut.add("push", lambda event: release.wait(5))
+        sut.dispatch("push", {})
+        with pytest.raises(errors.OctokitBackpressureError):
+            sut.dispatch("push", {})
+        release.set()
+        sut.close()
+
+
+class TestAsyncDispatcher(object):
+    def test_coroutine_and_plain_handlers_run_as_tasks(self):
+        calls = []
+        sut = AsyncDispatcher()
+
+        @sut.on("issues.opened")
+        async def opened(event):
+            await asyncio.sleep(0)
+            calls.append(event.action)
+
+        sut.add("issues", lambda event: calls.append(event.name))
+
+        async def run():
+            tasks = await sut.dispatch("issues", {"action": "opened"})
+            await sut.join()
+            return tasks
+
+        assert len(asyncio.run(run())) == 2
+        assert sorted(calls) == ["issues", "opened"]
+
+    def test_dispatch_applies_backpressure(self):
+        sut = AsyncDispatcher(max_pending=1, timeout=0.01)
+        sut.add("push", lambda event: asyncio.sleep(1))
+
+        async def run():
+            await sut.dispatch("push", {})
+            with pytest.raises(errors.OctokitBackpressureError):
+                await sut.dispatch("push", {})
+            sut.close()
+
+        asyncio.run(run())
+
+    def test_dispatch_does_not_wait_for_room_by_default(self):
+        sut = AsyncDispatcher(max_pending=1)
+        sut.add("push", lambda event: asyncio.sleep(1))
+
+        async def run():
+            await sut.dispatch("push", {})
+            with pytest.raises(errors.OctokitBackpressureError):
+                await sut.dispatch("push", {})
+            sut.close()
+
+        asyncio.run(run())
@@ -0,0 +1,161 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from octokit import Octokit
+from octokit import errors
+from octokit.graphql import GraphQLBatch
+from octokit.graphql import estimate_nodes
+from octokit.graphql import graphql_literal
+from octokit.retry import RetryPolicy
+
+field_regex = re.compile(
+    r'(q\d+): repository\(owner: "([^"]+)", name: "([^"]+)"\)(?: \{ issues\(first: 2, after: (null|"c\d+")\))?'
+)  # noqa E501
+
+
+class GraphQLStub(BaseHTTPRequestHandler):
+    """Answers aliased ``repository`` fields; every repository has five issues, two per page."""
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((dict(self.headers), body))
+        data, response_errors = {}, []
+        for alias, owner, name, cursor in field_regex.findall(body["query"]):
+            if name == "missing":
+                data[alias] = None
+                response_errors.append({"path": [alias], "message": "Could not resolve to a Repository"})
+            else:
+                data[alias] = {"nameWithOwner": "{}/{}".format(owner, name), "issues": self.issues(cursor)}
+        content = json.dumps({"data": data, "errors": response_errors} if response_errors else {"data": data})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(content.encode("utf-8"))
+
+    def issues(self, cursor):
+        start = int(cursor.strip('"c')) if cursor and cursor != "null" else 0
+        end = min(start + 2, 5)
+        return {
+            "nodes": [{"number": number} for number in range(start + 1, end + 1)],
+            "pageInfo": {"hasNextPage": end < 5, "endCursor": "c{}".format(end)},
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    monkeypatch.setenv("NO_PROXY", "127.0.0.1")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), GraphQLStub)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    GraphQLStub.requests = []
+    yield "http://127.0.0.1:{}".format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def client(stub, **kwargs):
+    octokit = Octokit(auth="token", token="yak", **kwargs)
+    octokit.base_url = stub
+    return octokit
+
+
+repository = "repository(owner: $owner, name: $name) { nameWithOwner }"
+repository_issues = "repository(owner: $owner, name: $name) { issues(first: 2, after: $cursor) { nodes { number } pageInfo { hasNextPage endCursor } } }"  # noqa E501
+
+
+class TestGraphQL(object):
+    def test_graphql_uses_the_client_authentication(self, stub):
+        result = client(stub).graphql('query { q0: repository(owner: "octokit", name: "octokit.py") { id } }', a=1)
+        assert result.json["data"]["q0"]["nameWithOwner"] == "octokit/octokit.py"
+        headers, body = GraphQLStub.requests[0]
+        assert headers["Authorization"] == "token yak"
+        assert body["variables"] == {"a": 1}
+
+    def test_graphql_is_retried_when_opted_in(self, mocker):
+        mocker.patch("random.uniform", return_value=0)
+        post = mocker.patch(
+            "requests.Session.post",
+            side_effect=[mocker.Mock(status_code=502), mocker.Mock(status_code=200, json=lambda: {"data": {}})],
+        )
+        result = Octokit(retry=RetryPolicy(operations=["graphql"])).graphql("query { viewer { login } }")
+        assert result.json == {"data": {}}
+        assert post.call_count == 2
+        assert post.call_args[0][0] == "https://api.github.com/graphql"
+
+    def test_batch_merges_queries_into_one_document(self, stub):
+        sut = GraphQLBatch(client(stub))
+        for name in ("octokit.py", "missing", "rest.js"):
+            sut.add(repository, owner="octokit", name=name)
+        results = sut.execute()
+        assert len(GraphQLStub.requests) == 1
+        assert results[0]["nameWithOwner"] == "octokit/octokit.py"
+        assert isinstance(results[1], errors.OctokitGraphQLError)
+        assert str(results[1]) == "Could not resolve to a Repository"
+        assert results[2]["nameWithOwner"] == "octokit/rest.js"
+        assert len(sut) == 0
+
+    def test_batch_splits_documents_at_the_query_limit(self, stub):
+        sut = GraphQLBatch(client(stub), max_queries=2)
+        indexes = [sut.add(repository, owner="octokit", name="repo{}".format(i)) for i in range(5)]
+        results = sut.execute()
+        assert indexes == [0, 1, 2, 3, 4]
+        assert len(GraphQLStub.requests) == 3
+        assert [r["nameWithOwner"] for r in results] == ["octokit/repo{}".format(i) for i in range(5)]
+
+    def test_batch_paginates_connections_together(self, stub):
+        sut = GraphQLBatch(client(stub))
+        sut.add(repository_issues, connection="issues", owner="octokit", name="octokit.py")
+        sut.add(repository_issues, connection="issues", owner="octokit", name="rest.js")
+        results = sut.execute()
+        assert len(GraphQLStub.requests) == 3
+        for result in results:
+            assert [issue["number"] for issue in result["issues"]["nodes"]] == [1, 2, 3, 4, 5]
+            assert result["issues"]["pageInfo"]["hasNextPage"] is False
+
+    def test_variables_are_only_inlined_outside_strings(self):
+        sut = GraphQLBatch(Octokit())
+        sut.add('search(query: "price:$5 $owner", type: ISSUE, first: $first) { issueCount }', first=5, owner="x")
+        assert sut.render(sut._queries) == (
+            'query {\n  q0: search(query: "price:$5 $owner", type: ISSUE, first: 5) { issueCount }\n}'
+        )
+        with pytest.raises(errors.OctokitParameterError):
+            sut.add(repository, owner="octokit", nme="octokit.py")
+        assert len(sut) == 1
+
+    def test_connection_errors_fail_the_queries_of_the_document(self, mocker):
+        error = requests.ConnectionError("connection refused")
+        mocker.patch("requests.Session.post", side_effect=error)
+        sut = GraphQLBatch(Octokit(auth="token", token="yak"))
+        sut.add(repository, owner="octokit", name="octokit.py")
+        sut.add(repository, owner="octokit", name="rest.js")
+        results = sut.execute()
+        assert all(isinstance(result, errors.OctokitGraphQLError) for result in results)
+        assert results[0].__cause__ is error
+
+    def test_timeouts_are_raised(self, mocker):
+        mocker.patch("requests.Session.post", side_effect=errors.OctokitTimeoutError("deadline of 1s exceeded"))
+        sut = GraphQLBatch(Octokit(auth="token", token="yak"))
+        sut.add(repository, owner="octokit", name="octokit.py")
+        with pytest.raises(errors.OctokitTimeoutError):
+            sut.execute()
+
+    def test_estimate_nodes(self):
+        selection = "repository { issues(first: 100) { nodes { labels(first: 10) { nodes { name } } } } }"
+        assert estimate_nodes(selection) == 1100
+        assert estimate_nodes("viewer { login }") == 1
+
+    def test_graphql_literal(self):
+        assert graphql_literal({"labels": ["bug", 'say "hi"'], "first": 10, "after": None}) == (
+            '{labels: ["bug", "say \\"hi\\""], first: 10, after: null}'
+        )
@@ -0,0 +1,74 @@
+import os
+import time
+from collections import namedtuple
+
+import pytest
+
+from conftest import make_response
+from octokit.installations import InstallationPool
+from octokit.tokens import InstallationTokenManager
+from octokit.transport import Transport
+
+Response = namedtuple("Response", ["json"])
+
+
+@pytest.fixture
+def private_key():
+    with open(os.path.join(os.path.dirname(__file__), "test.pem"), "r") as f:
+        return f.read()
+
+
+@pytest.fixture
+def manager(mocker, private_key):
+    mocker.patch(
+        "requests.Session.post",
+        return_value=Response(json=lambda: {"token": "t", "expires_at": "2099-01-01T00:00:00Z"}),
+    )
+    return InstallationTokenManager("42", private_key, background=False)
+
+
+def rate_limited_response(remaining):
+    headers = {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time()) + 3600),
+    }
+    return make_response(headers=headers)
+
+
+class TestInstallationPool(object):
+    def test_clients_are_reused_per_installation(self, private_key, manager):
+        transport = Transport()
+        sut = InstallationPool("42", private_key, token_manager=manager, transport=transport, timeout=10)
+        first = sut.client(1)
+        assert sut.client(installation_id=1) is first
+        assert sut.client(2) is not first
+        assert len(sut) == 2
+        assert first.transport is sut.client(2).transport is transport
+        assert first.token_manager is manager
+        assert first.timeout == 10
+        assert first.rate_limiter is not sut.client(2).rate_limiter
+
+    def test_clients_can_be_looked_up_by_repository(self, mocker, private_key, manager):
+        get = mocker.patch("requests.Session.get", return_value=Response(json=lambda: {"id": 7}))
+        sut = InstallationPool("42", private_key, token_manager=manager)
+        assert sut.client(owner="octokit", repo="octokit.py") is sut.client(7)
+        assert sut.client(owner="octokit", repo="octokit.py").installation_id == 7
+        assert get.call_count == 1
+
+    def test_repository_lookups_use_the_pool_transport_and_timeout(self, mocker, private_key, manager):
+        transport = Transport()
+        get = mocker.patch.object(transport.session, "get", return_value=Response(json=lambda: {"id": 7}))
+        sut = InstallationPool("42", private_key, token_manager=manager, transport=transport, timeout=3)
+        assert sut.client(owner="octokit", repo="octokit.py").installation_id == 7
+        assert get.call_args[1]["timeout"] == 3
+
+    def test_installations_are_scheduled_by_remaining_budget(self, mocker, private_key, manager):
+        sut = InstallationPool("42", private_key, token_manager=manager)
+        for installation_id, remaining in ((1, 10), (2, 4000), (3, 500)):
+            mocker.patch("requests.Session.get", return_value=rate_limited_response(remaining))
+            sut.client(installation_id).repos.get(owner="octokit", repo="octokit.py")
+        assert sut.remaining(2) == 4000
+        assert sut.remaining(4) is None
+        assert sut.by_budget([1, 2, 3]) == [2, 3, 1]
+        assert sut.by_budget([1, 4, 2]) == [4, 2, 1]
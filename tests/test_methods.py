@@ -5,6 +5,7 @@ import pytest
 import requests
 
 from octokit import Octokit
+from octokit import ResponseData
 from octokit import errors
 
 
@@ -27,10 +28,10 @@ class TestClientMethods(object):
         assert Octokit().oauth_authorizations.list_your_grants.__name__ == "list_your_grants"
 
     def test_method_calls_requests(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         Octokit().oauth_authorizations.get_authorization(authorization_id=1)
-        assert requests.get.called
-        assert requests.get.call_count == 1
+        assert requests.Session.get.called
+        assert requests.Session.get.call_count == 1
 
     def test_has_required_method_parameters(self):
         with pytest.raises(errors.OctokitParameterError) as e1:
@@ -46,17 +47,17 @@ class TestClientMethods(object):
         assert "notvalid is not a valid parameter" == str(e.value)
 
     def test_validate_method_parameters(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         Octokit().oauth_authorizations.get_authorization(authorization_id=100)
-        requests.get.assert_called_once_with(
+        requests.Session.get.assert_called_once_with(
             "https://api.github.com/authorizations/100", params={}, headers=Octokit().headers
         )
 
     def test_request_has_body_parameters(self, mocker):
-        mocker.patch("requests.post")
+        mocker.patch("requests.Session.post")
         data = {"note": "remind me", "scopes": ["public_repo"]}
         create = Octokit().oauth_authorizations.create_authorization(**data)
-        requests.post.assert_called_once_with(
+        requests.Session.post.assert_called_once_with(
             "https://api.github.com/authorizations", data=json.dumps(data, sort_keys=True), headers=create.headers
         )
 
@@ -67,7 +68,7 @@ class TestClientMethods(object):
         assert "gist_id is not a valid parameter" == str(e.value)
 
     def test_must_include_required_dictionary_sub_parameters_when_used(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         data = {"owner": "owner", "repo": "repo", "name": "name"}
         with pytest.raises(errors.OctokitParameterError) as e:
             Octokit().checks.create(**data)
@@ -80,7 +81,7 @@ class TestClientMethods(object):
         Octokit().checks.create(**data)
 
     def test_must_include_required_array_sub_parameters_when_used(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         data = {"owner": "owner", "repo": "repo", "name": "name", "head_sha": "master", "actions": []}
         with pytest.raises(errors.OctokitParameterError) as e:
             Octokit().checks.create(**data)
@@ -93,7 +94,7 @@ class TestClientMethods(object):
         Octokit().checks.create(**data)
 
     def test_schema_types_must_match(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         data = {
             "owner": "owner",
             "repo": "repo",
@@ -106,7 +107,7 @@ class TestClientMethods(object):
         assert f'dict type does not match the schema type of array for the data of {data["actions"]}' == str(e.value)
 
     def test_use_default_parameter_values(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         headers = {"Content-Type": "application/json", "accept": "application/vnd.github.v3+json"}
         data = {
             "visibility": "all",
@@ -117,10 +118,10 @@ class TestClientMethods(object):
             "page": 1,
         }
         Octokit().repos.list_for_authenticated_user()
-        requests.get.assert_called_once_with("https://api.github.com/user/repos", params=data, headers=headers)
+        requests.Session.get.assert_called_once_with("https://api.github.com/user/repos", params=data, headers=headers)
 
     def test_deprecated_methods_are_available(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         headers = {"Content-Type": "application/json", "accept": "application/vnd.github.v3+json"}
         data = {
             "visibility": "all",
@@ -131,14 +132,14 @@ class TestClientMethods(object):
             "page": 1,
         }
         Octokit().repos.list()
-        requests.get.assert_called_once_with("https://api.github.com/user/repos", params=data, headers=headers)
+        requests.Session.get.assert_called_once_with("https://api.github.com/user/repos", params=data, headers=headers)
 
     def test_use_passed_value_instead_of_default_parameter_values(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         headers = {"Content-Type": "application/json", "accept": "application/vnd.github.v3+json"}
         data = {"sort": "updated", "per_page": 30, "page": 1}
         Octokit().issues.list_comments_for_repo(owner="testUser", repo="testRepo", **data)
-        requests.get.assert_called_once_with(
+        requests.Session.get.assert_called_once_with(
             "https://api.github.com/repos/testUser/testRepo/issues/comments", params=data, headers=headers
         )
 
@@ -148,58 +149,79 @@ class TestClientMethods(object):
         assert "closeddddd is not a valid option for state; must be one of ['open', 'closed']" == str(e.value)
 
     def test_validate_boolean_values(self, mocker):
-        mocker.patch("requests.post")
+        mocker.patch("requests.Session.post")
         Octokit().repos.create_deployment(owner="testUser", repo="testRepo", ref="abc123")
         data = '{"auto_merge": true, "description": "", "environment": "production", "payload": "", "ref": "abc123", "task": "deploy", "transient_environment": false}'  # noqa E501
         headers = {"Content-Type": "application/json", "accept": "application/vnd.github.v3+json"}
-        requests.post.assert_called_once_with(
+        requests.Session.post.assert_called_once_with(
             "https://api.github.com/repos/testUser/testRepo/deployments", data=data, headers=headers
         )
 
     def test_non_default_params_not_in_the_url_for_get_requests_go_in_the_query_string(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         params = {"page": 2, "per_page": 30}
         Octokit().oauth_authorizations.list_grants(page=2)
-        requests.get.assert_called_once_with(
+        requests.Session.get.assert_called_once_with(
             "https://api.github.com/applications/grants", params=params, headers=Octokit().headers
         )
 
     def test_does_not_use_previous_values(self, mocker):
-        mocker.patch("requests.patch")
-        mocker.patch("requests.post")
+        mocker.patch("requests.Session.patch")
+        mocker.patch("requests.Session.post")
         headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
         data = {"state": "closed"}
         issue = Octokit().issues.update(owner="testUser", repo="testRepo", issue_number=1, **data)
-        requests.patch.assert_called_with(
+        requests.Session.patch.assert_called_with(
             "https://api.github.com/repos/testUser/testRepo/issues/1", data=json.dumps(data), headers=headers
         )
         issue.pulls.create(owner="user", head="branch", base="master", title="Title", repo="testRepo")
-        requests.post.assert_called_with(
+        requests.Session.post.assert_called_with(
             "https://api.github.com/repos/user/testRepo/pulls",
             data=json.dumps({"base": "master", "head": "branch", "title": "Title"}, sort_keys=True),
             headers={"Content-Type": "application/json", "accept": "application/vnd.github.v3+json"},
         )
 
     def test_returned_object_is_not_self_but_a_copy_of_self(self, mocker):
-        mocker.patch("requests.patch")
+        mocker.patch("requests.Session.patch")
         headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
         octokit = Octokit()
         sut = octokit.issues.update(owner="testUser", repo="testRepo", issue_number=1)
-        requests.patch.assert_called_once_with(
+        requests.Session.patch.assert_called_once_with(
             "https://api.github.com/repos/testUser/testRepo/issues/1", data="{}", headers=headers
         )
         assert sut.__class__.__name__ == "Octokit"
         assert sut != octokit
 
+    def test_returned_object_is_not_a_deep_copy(self, mocker):
+        mocker.patch("requests.Session.patch")
+        octokit = Octokit(auth="token", token="yak")
+        sut = octokit.issues.update(owner="testUser", repo="testRepo", issue_number=1)
+        assert sut._routes is octokit._routes
+        assert sut.headers is octokit.headers
+        assert sut.token == "yak"
+        assert sut.issues._octokit is sut
+
+    def test_chained_url_attributes_are_copied_on_write(self, mocker):
+        mocker.patch("requests.Session.patch")
+        octokit = Octokit()
+        issue = octokit.issues.update(owner="testUser", repo="testRepo", issue_number=1)
+        assert dict(octokit._attribute_cache) == {}
+        assert issue._attribute_cache["url"] == {"owner": "testUser", "repo": "testRepo", "issue_number": 1}
+        same = issue.issues.update(owner="testUser", repo="testRepo", issue_number=1)
+        assert same._attribute_cache is issue._attribute_cache
+        other = issue.issues.update(owner="testUser", repo="testRepo", issue_number=2)
+        assert other._attribute_cache["url"]["issue_number"] == 2
+        assert issue._attribute_cache["url"]["issue_number"] == 1
+
     def test_returned_object_has_requests_response_object(self, mocker):
-        patch = mocker.patch("requests.patch")
+        patch = mocker.patch("requests.Session.patch")
         Response = namedtuple("Response", ["json"])
         patch.return_value = Response(json=lambda: {})
         sut = Octokit().issues.update(owner="testUser", repo="testRepo", issue_number=1)
         assert sut._response.__class__.__name__ == "Response"
 
     def test_returned_object_has_json_attribute(self, mocker):
-        patch = mocker.patch("requests.get")
+        patch = mocker.patch("requests.Session.get")
         Request = namedtuple("Request", ["json"])
         patch.return_value = Request(json=lambda: data)
         data = {
@@ -210,7 +232,7 @@ class TestClientMethods(object):
         assert sut.json == data
 
     def test_returned_object_has_response_attributes(self, mocker):
-        patch = mocker.patch("requests.patch")
+        patch = mocker.patch("requests.Session.patch")
         data = {
             "id": 1,
             "number": 1347,
@@ -225,13 +247,13 @@ class TestClientMethods(object):
         assert sut.response.id == 1
         assert sut.response.number == 1347
         assert sut.response.state == "open"
-        assert str(sut.response.user) == "<class 'octokit.ResponseData'>"
+        assert isinstance(sut.response.user, ResponseData)
         assert sut.response.user.login == "octocat"
         assert sut.response.user.site_admin is False
         assert sut.response.labels[0].id == 208045946
 
     def test_returned_object_is_a_list(self, mocker):
-        patch = mocker.patch("requests.patch")
+        patch = mocker.patch("requests.Session.patch")
         data = [{"id": 208045946}, {"id": 208045947}]
         Request = namedtuple("Request", ["json"])
         patch.return_value = Request(json=lambda: data)
@@ -239,22 +261,24 @@ class TestClientMethods(object):
         assert sut.response[0].id == 208045946
 
     def test_an_exception_with_json_is_replaced_by_the_raw_text(self, mocker):
-        patch = mocker.patch("requests.patch")
+        patch = mocker.patch("requests.Session.patch")
         Request = namedtuple("Request", ["json"])
         patch.return_value = Request(json=lambda: "test")
         sut = Octokit().issues.update(owner="testUser", repo="testRepo", issue_number=1)
         assert sut.json == "test"
 
     def test_can_pass_in_optional_headers(self, mocker):
-        mocker.patch("requests.get")
+        mocker.patch("requests.Session.get")
         headers = {"accept": "application/vnd.github.ant-man-preview+json", "Content-Type": "application/json"}
         Octokit().oauth_authorizations.get_authorization(
             authorization_id=100, headers={"accept": "application/vnd.github.ant-man-preview+json"}
         )
-        requests.get.assert_called_once_with("https://api.github.com/authorizations/100", params={}, headers=headers)
+        requests.Session.get.assert_called_once_with(
+            "https://api.github.com/authorizations/100", params={}, headers=headers
+        )
 
     def test_dictionary_keys_are_validated(self, mocker):
-        mocker.patch("requests.put")
+        mocker.patch("requests.Session.put")
         headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
         data = {
             "required_status_checks": {"strict": True, "contexts": ["a", "b"]},
@@ -263,14 +287,14 @@ class TestClientMethods(object):
             "restrictions": {"users": [], "teams": []},
         }
         Octokit().repos.update_branch_protection(owner="user", repo="repo", branch="branch", **data)
-        requests.put.assert_called_with(
+        requests.Session.put.assert_called_with(
             "https://api.github.com/repos/user/repo/branches/branch/protection",
             data=json.dumps(data, sort_keys=True),
             headers=headers,
         )
 
     def test_dictionary_keys_are_validated_multiple_times_in_a_row(self, mocker):
-        mocker.patch("requests.put")
+        mocker.patch("requests.Session.put")
         headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
         data = {
             "required_status_checks": {"strict": True, "contexts": []},
@@ -280,7 +304,7 @@ class TestClientMethods(object):
         }
         for run in range(4):
             Octokit().repos.update_branch_protection(owner="user", repo="repo", branch="branch{}".format(run), **data)
-            requests.put.assert_called_with(
+            requests.Session.put.assert_called_with(
                 "https://api.github.com/repos/user/repo/branches/branch{}/protection".format(run),
                 data=json.dumps(data, sort_keys=True),
                 headers=headers,
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import hmac
+import io
+
+from octokit.middleware import AsyncWebhookMiddleware
+from octokit.middleware import WebhookMiddleware
+
+payload = b'{"action": "opened", "number": 1}'
+
+
+def signed_headers(body=payload, secret=b"secret"):
+    return {
+        "X-Hub-Signature-256": "sha256=" + hmac.new(secret, body, hashlib.sha256).hexdigest(),
+        "X-GitHub-Event": "pull_request",
+        "X-GitHub-Delivery": "72d3162f-cc78-11e3-81ab-4c9367dc0958",
+        "Content-Length": str(len(body)),
+    }
+
+
+def environ(headers, body=payload, path="/webhooks"):
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": "POST", "wsgi.input": io.BytesIO(body)}
+    for name, value in headers.items():
+        key = "CONTENT_LENGTH" if name == "Content-Length" else "HTTP_" + name.upper().replace("-", "_")
+        environ[key] = value
+    return environ
+
+
+class WSGIApp(object):
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, environ, start_response):
+        self.calls.append((environ["octokit.webhook.body"], environ["wsgi.input"].read()))
+        start_response("200 OK", [])
+        return [b"ok"]
+
+
+def call_wsgi(middleware, environ):
+    statuses = []
+    body = middleware(environ, lambda status, headers: statuses.append(status))
+    return statuses[0], b"".join(body)
+
+
+class TestWebhookMiddleware(object):
+    def test_verified_bodies_are_passed_to_the_app(self):
+        app = WSGIApp()
+        sut = WebhookMiddleware(app, "secret", path="/webhooks")
+        sut.chunk_size = 4
+        assert call_wsgi(sut, environ(signed_headers())) == ("200 OK", b"ok")
+        assert app.calls == [(payload, payload)]
+
+    def test_bad_signatures_are_rejected(self):
+        app = WSGIApp()
+        sut = WebhookMiddleware(app, "secret", path="/webhooks")
+        assert call_wsgi(sut, environ(signed_headers(secret=b"wrong"))) == ("401 Unauthorized", b"Unauthorized")
+        headers = signed_headers()
+        del headers["X-Hub-Signature-256"]
+        assert call_wsgi(sut, environ(headers))[0] == "401 Unauthorized"
+        assert app.calls == []
+
+    def test_invalid_headers_are_rejected_before_reading_the_body(self):
+        sut = WebhookMiddleware(WSGIApp(), "secret", path="/webhooks")
+        headers = dict(signed_headers(), **{"X-GitHub-Delivery": "not-a-guid"})
+        request = environ(headers)
+        assert call_wsgi(sut, request)[0] == "400 Bad Request"
+        assert request["wsgi.input"].tell() == 0
+
+    def test_large_bodies_are_rejected(self):
+        sut = WebhookMiddleware(WSGIApp(), "secret", path="/webhooks", max_body_size=10)
+        request = environ(signed_headers())
+        assert call_wsgi(sut, request)[0] == "413 Payload Too Large"
+        assert request["wsgi.input"].tell() == 0
+
+    def test_other_requests_go_to_the_app(self):
+        app = WSGIApp()
+        sut = WebhookMiddleware(lambda environ, start_response: [b"other"], "secret", path="/webhooks")
+        assert sut(environ({}, path="/health"), None) == [b"other"]
+        assert app.calls == []
+
+
+class TestAsyncWebhookMiddleware(object):
+    def run(self, middleware, headers, chunks):
+        messages = [{"type": "http.request", "body": c, "more_body": i < len(chunks) - 1} for i, c in enumerate(chunks)]
+        sent, received = [], []
+        scope = {
+            "type": "http",
+            "path": "/webhooks",
+            "method": "POST",
+            "headers": [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers.items()],
+        }
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        async def app(scope, receive, send):
+            received.append((scope["octokit.webhook.body"], (await receive())["body"]))
+            await send({"type": "http.response.start", "status": 204, "headers": []})
+
+        asyncio.run(middleware(app)(scope, receive, send))
+        return sent[0]["status"], received
+
+    def test_streamed_bodies_are_verified(self):
+        middleware = lambda app: AsyncWebhookMiddleware(app, "secret", path="/webhooks")  # noqa E731
+        headers = signed_headers()
+        del headers["Content-Length"]
+        assert self.run(middleware, headers, [payload[:10], payload[10:]]) == (204, [(payload, payload)])
+        assert self.run(middleware, signed_headers(secret=b"wrong"), [payload]) == (401, [])
+
+    def test_streamed_bodies_are_limited(self):
+        middleware = lambda app: AsyncWebhookMiddleware(app, "secret", path="/webhooks", max_body_size=20)  # noqa E731
+        headers = signed_headers()
+        del headers["Content-Length"]
+        assert self.run(middleware, headers, [payload[:10], payload[10:20], payload[20:]]) == (413, [])
@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 
 
@@ -72,3 +75,150 @@ class TestOctokit(object):
         assert "/developer.github.com" in octokit.issues.create.__doc__
         octokit = Octokit(routes="api.github.com")
         assert "/developer.github.com" in octokit.issues.create.__doc__
+
+    def test_route_table_is_built_once_and_shared_between_clients(self):
+        from octokit import Octokit
+
+        first, second = Octokit(), Octokit()
+        assert first._routes is second._routes
+        assert type(first.issues) is type(second.issues)
+        assert first.issues._octokit is first
+        assert second.issues._octokit is second
+        assert Octokit(routes="ghe-2.18")._routes is not first._routes
+
+    def test_route_table_is_keyed_by_routes_name_and_version(self):
+        from octokit_routes import specifications
+
+        from octokit import routes
+
+        routes.get_route_table("ghe-2.19")
+        assert ("ghe-2.19", specifications["ghe-2.19"]["info"]["version"]) in routes._route_tables
+
+    def test_unknown_attributes_raise_attribute_error(self):
+        from octokit import Octokit
+
+        with pytest.raises(AttributeError):
+            Octokit().not_a_namespace
+
+    def test_concurrent_pagination_yields_pages_in_order(self):
+        from octokit import Octokit
+
+        threads = set()
+
+        def sut_obj(page=None, **kwargs):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01 * (4 - page))
+            return MockResponse(page, **kwargs)
+
+        p = Octokit().paginate(sut_obj, concurrency=3, param="value")
+        assert [page["page"] for page in p] == [1, 2, 3, 4]
+        assert len(threads) > 1
+
+    def test_concurrent_pagination_of_a_single_page(self):
+        from octokit import Octokit
+
+        p = Octokit().paginate(MockResponseWithoutLinks, concurrency=3, param="value")
+        assert list(p) == [{"page": 1, "kwargs": {"param": "value", "link": ""}}]
+
+    def test_concurrent_pagination_falls_back_without_a_last_page(self):
+        from octokit import Octokit
+
+        link = '<https://api.github.com/installation/repositories?page={}>; rel="next"'
+
+        def sut_obj(page=None, **kwargs):
+            return MockResponse(page, link=link.format(page + 1) if page < 3 else "", **kwargs)
+
+        assert list(Octokit().paginate(sut_obj, concurrency=3)) == list(Octokit().paginate(sut_obj))
+
+    def test_paginate_items_flattens_wrapped_lists(self):
+        from octokit import Octokit
+
+        def sut_obj(page=None, **kwargs):
+            response = MockResponse(page, **kwargs)
+            response.json = {"total_count": 8, "workflow_runs": [page * 10, page * 10 + 1]}
+            return response
+
+        assert list(Octokit().paginate_items(sut_obj)) == [10, 11, 20, 21, 30, 31, 40, 41]
+
+    def test_paginate_items_of_plain_lists_and_keys(self):
+        from octokit import errors
+        from octokit import page_items
+
+        assert page_items([1, 2]) == [1, 2]
+        assert page_items({"total_count": 1, "incomplete_results": False, "items": [1]}) == [1]
+        assert page_items({"total_count": 0, "workflow_runs": []}) == []
+        assert page_items({"repository_selection": "all", "repositories": [1]}) == [1]
+        with pytest.raises(errors.OctokitPaginationError, match="Not Found"):
+            page_items({"message": "Not Found", "documentation_url": "https://docs.github.com"})
+        with pytest.raises(errors.OctokitPaginationError):
+            page_items({"total_count": 0, "labels": []})
+        assert page_items({"repositories": [1], "check_runs": [2]}, key="check_runs") == [2]
+
+    def test_paginate_items_prefetches_while_a_page_is_consumed(self):
+        from octokit import Octokit
+
+        requested = []
+        prefetched = threading.Event()
+
+        def sut_obj(page=None, **kwargs):
+            requested.append(page)
+            if page == 3:
+                prefetched.set()
+            response = MockResponse(page, **kwargs)
+            response.json = [page]
+            return response
+
+        items = Octokit().paginate_items(sut_obj, lookahead=2)
+        assert next(items) == 1
+        assert prefetched.wait(5)
+        assert sorted(requested) == [1, 2, 3]
+        assert list(items) == [2, 3, 4]
+        assert sorted(requested) == [1, 2, 3, 4]
+
+    def test_paginate_items_follows_next_links_without_a_last_page(self):
+        from octokit import Octokit
+
+        link = '<https://api.github.com/installation/repositories?page={}>; rel="next"'
+
+        def sut_obj(page=None, **kwargs):
+            response = MockResponse(page, link=link.format(page + 1) if page < 3 else "", **kwargs)
+            response.json = [page]
+            return response
+
+        assert list(Octokit().paginate_items(sut_obj, lookahead=4)) == [1, 2, 3]
+
+    def test_batch_returns_results_and_exceptions_in_order(self, mocker):
+        from octokit import Octokit
+        from octokit import errors
+
+        in_flight, peak = [], []
+        lock = threading.Lock()
+
+        def get(url, **kwargs):
+            with lock:
+                in_flight.append(url)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(url)
+            return mocker.Mock(json=lambda: {"url": url})
+
+        mocker.patch("requests.Session.get", side_effect=get)
+        calls = [("repos", "get", {"owner": "octokit", "repo": "repo{}".format(i)}) for i in range(8)]
+        calls.insert(3, ("repos", "get", {"owner": "octokit"}))
+        results = Octokit().batch(calls, concurrency=3)
+        assert len(results) == 9
+        assert isinstance(results[3], errors.OctokitParameterError)
+        assert [r.json["url"] for r in results[:3]] == [
+            "https://api.github.com/repos/octokit/repo{}".format(i) for i in range(3)
+        ]
+        assert results[8].json["url"] == "https://api.github.com/repos/octokit/repo7"
+        assert max(peak) <= 3
+
+    def test_batch_rejects_unknown_methods_before_sending(self, mocker):
+        from octokit import Octokit
+
+        get = mocker.patch("requests.Session.get")
+        with pytest.raises(AttributeError):
+            Octokit().batch([("repos", "get", {"owner": "octokit", "repo": "octokit.py"}), ("repos", "nope", {})])
+        assert not get.called
@@ -0,0 +1,180 @@
+import json
+import random
+
+import pytest
+
+from octokit import webhook
+from octokit.dispatch import Dispatcher
+from octokit.payload import PayloadView
+
+BODY = json.dumps(
+    {
+        "action": "completed",
+        "workflow_run": {"jobs": [{"id": n, "repository": {"full_name": "{/}"}} for n in range(100)]},
+        "repository": {"full_name": "octokit/octokit.py"},
+        "installation": {"id": 7},
+    }
+).encode("utf-8")
+
+KEYS = ["action", "a", "k", "café", "ключ", "x/y", 'q"uote', "back\\slash", "emoji\U0001f600"]
+STRINGS = KEYS + ["{", "]}", '"k": 1', "\\", ""]
+
+
+def escape(character):
+    if character in '"\\' or ord(character) > 0xFFFF:
+        return json.dumps(character)[1:-1]
+    return "\\u{:04x}".format(ord(character))
+
+
+def spell(text, rng):
+    """A JSON string literal for ``text`` in one of the spellings JSON encoders use."""
+    choice = rng.randrange(4)
+    if choice == 0:
+        return json.dumps(text)
+    if choice == 1:
+        return json.dumps(text, ensure_ascii=False)
+    if choice == 2:
+        return json.dumps(text, ensure_ascii=False).replace("/", "\\/")
+    return '"' + "".join(escape(character) for character in text) + '"'
+
+
+def dump(value, rng):
+    if isinstance(value, dict):
+        fields = ("{}{}:{}".format(spell(k, rng), rng.choice(["", " ", "\n"]), dump(v, rng)) for k, v in value.items())
+        return "{" + ", ".join(fields) + "}"
+    if isinstance(value, list):
+        return "[" + ",".join(dump(item, rng) for item in value) + "]"
+    if isinstance(value, str):
+        return spell(value, rng)
+    return json.dumps(value)
+
+
+def random_value(rng, depth):
+    choice = rng.random()
+    if depth == 0 or choice < 0.4:
+        return rng.choice([rng.randint(-5, 5), None, True, 1.5, rng.choice(STRINGS)])
+    if choice < 0.7:
+        return random_object(rng, depth - 1)
+    return [random_value(rng, depth - 1) for _ in range(rng.randint(0, 3))]
+
+
+def random_object(rng, depth):
+    return {key: random_value(rng, depth) for key in rng.sample(KEYS, rng.randint(0, len(KEYS)))}
+
+
+class TestPayloadView(object):
+    def test_only_requested_fields_are_decoded(self):
+        sut = PayloadView(BODY)
+        assert sut["action"] == "completed"
+        assert list(sut._values) == ["action"]
+        assert sut.get("installation.id") == 7
+        assert sut.get("repository.full_name") == "octokit/octokit.py"
+        assert "workflow_run" not in sut._values
+        assert list(sut._fields) == ["action", "installation", "repository"]
+        assert sut._data is None
+
+    def test_nested_keys_and_strings_are_not_mistaken_for_fields(self):
+        body = b'{"a": {"k": 1}, "b": "x\\"k\\": 2", "c": "k", "d": [{"k": "}"}]}'
+        assert PayloadView(body).get("k") is None
+        body = b'{"k": 3, "a": {"k": 1}, "b": "{[\\\\", "c": [{"k": "]"}]}'
+        assert PayloadView(body)["k"] == 3
+        assert PayloadView(body)["c"] == [{"k": "]"}]
+
+    def test_deeply_nested_values_are_skipped(self):
+        body = b'{"a": ' + b"[" * 40 + b'"]"' + b"]" * 40 + b', "k": 5, "z": {"k": 6}}'
+        sut = PayloadView(body)
+        assert sut["k"] == 5
+        assert sut.data["a"] == json.loads(body)["a"]
+
+    def test_dotted_paths_return_the_default_when_missing(self):
+        sut = PayloadView(BODY)
+        assert sut.get("installation.id") == 7
+        assert sut.get("workflow_run.jobs.id") is None
+        assert sut.get("sender.login", "ghost") == "ghost"
+        assert sut.get("action.name") is None
+
+    def test_whole_payload_is_parsed_once(self):
+        sut = PayloadView(BODY)
+        sut.get("installation.id")
+        assert sut.data == json.loads(BODY)
+        assert sut.data is sut.data
+        assert len(sut) == 4
+        assert dict(sut) == json.loads(BODY)
+
+    @pytest.mark.parametrize("convert", [bytes, memoryview, bytearray, lambda body: body.decode("utf-8"), json.loads])
+    def test_accepts_bodies_of_any_type(self, convert):
+        assert PayloadView(convert(BODY)).get("installation.id") == 7
+
+    def test_whitespace_and_nested_strings(self):
+        sut = PayloadView(b' { "a" : "}," ,\n"b": {"c": "\\"d\\""} } ')
+        assert sut.get("b.c") == '"d"'
+        assert sut.data == {"a": "},", "b": {"c": '"d"'}}
+
+    def test_non_object_payloads(self):
+        assert PayloadView(b"[1, 2]").data == [1, 2]
+        assert PayloadView(b"[1, 2]").get("action") is None
+        assert PayloadView(b"{}").data == {}
+
+    @pytest.mark.parametrize("body", [b'{"a": 1 "b": 2}', b'{"a" 1}', b'{"a": 1', b"{"])
+    def test_malformed_payloads_raise(self, body):
+        with pytest.raises(ValueError):
+            PayloadView(body).data
+
+    @pytest.mark.parametrize("body", [b'{"a": 1 "b": 2}', b'{"a": [1, {"b": 2]', b'{"a": {"b": 2}'])
+    def test_malformed_fields_raise(self, body):
+        with pytest.raises(ValueError):
+            PayloadView(body)["a"]
+
+    @pytest.mark.parametrize("body", ['{"\\u0061ction": "opened"}', '{"caf\\u00e9": 1}', '{"café": 1}', '{"x\\/y": 2}'])
+    def test_keys_spelled_with_escapes(self, body):
+        sut = PayloadView(body.encode("utf-8"))
+        assert [sut.get(key) for key in KEYS] == [json.loads(body).get(key) for key in KEYS]
+
+    @pytest.mark.parametrize("seed", range(200))
+    def test_lookups_agree_with_json_loads(self, seed):
+        rng = random.Random(seed)
+        body = dump(random_object(rng, 4), rng)
+        expected = json.loads(body)
+        sut = PayloadView(body.encode("utf-8"))
+        for key in rng.sample(KEYS, len(KEYS)):
+            assert sut.get(key) == expected.get(key), body
+        assert sut.data == expected
+
+    def test_missing_keys_raise_key_error(self):
+        with pytest.raises(KeyError):
+            PayloadView(BODY)["sender"]
+
+    def test_verify_reads_the_app_id_of_a_ping_from_the_view(self):
+        headers = {
+            "X-Hub-Signature": "sha1=76b55589eeb1d5609a01922fc9a52475cf746a5b",
+            "X-GitHub-Event": "ping",
+            "X-GitHub-Delivery": "72d3162f-cc78-11e3-81ab-4c9367dc0958",
+        }
+        view = PayloadView(
+            b'{"hook": {"events": ["pull_request"], "app_id": 42, "id": 11, "active": true, "type": "App"}}'
+        )
+        assert webhook.verify(headers, view, "secret", events=["*"], return_app_id=True) == 42
+        assert view.get("hook.id") == 11
+
+    def test_verify_does_not_build_a_view_unless_it_returns_the_app_id(self, mocker):
+        headers = {
+            "X-Hub-Signature": "sha1=76b55589eeb1d5609a01922fc9a52475cf746a5b",
+            "X-GitHub-Event": "ping",
+            "X-GitHub-Delivery": "72d3162f-cc78-11e3-81ab-4c9367dc0958",
+        }
+        body = memoryview(
+            b'{"hook": {"events": ["pull_request"], "app_id": 42, "id": 11, "active": true, "type": "App"}}'
+        )
+        init = mocker.spy(PayloadView, "__init__")
+        assert webhook.verify(headers, body, "secret", events=["*"]) is True
+        assert not init.called
+        assert webhook.verify(headers, body, "secret", events=["*"], return_app_id=True) == 42
+        assert init.called
+
+    def test_dispatched_events_carry_the_view(self):
+        dispatcher = Dispatcher(max_workers=1)
+        event = dispatcher.event("workflow_run", BODY, "1")
+        assert event.action == "completed"
+        assert isinstance(event.payload, PayloadView)
+        assert list(event.payload._fields) == ["action"]
+        dispatcher.close()
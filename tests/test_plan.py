@@ -0,0 +1,61 @@
+import pytest
+
+from octokit import Octokit
+from octokit.plan import RequestPlan
+from octokit.plan import compile_plan
+
+
+class TestRequestPlan(object):
+    def test_operations_are_compiled_once(self, mocker):
+        mocker.patch("requests.Session.patch")
+        octokit = Octokit()
+        octokit.issues.update(owner="testUser", repo="testRepo", issue_number=1)
+        operation = octokit.issues.update.operation
+        plan = operation.plan
+        deepcopy = mocker.patch("copy.deepcopy")
+        Octokit().issues.update(owner="testUser", repo="testRepo", issue_number=2)
+        assert operation.plan is plan
+        assert not deepcopy.called
+
+    def test_plan_splits_parameters_by_location(self):
+        plan = compile_plan(self.definition, "post", "/repos/{owner}/{repo}/check-runs")
+        assert isinstance(plan, RequestPlan)
+        assert plan.path == "/repos/{owner}/{repo}/check-runs"
+        assert plan.path_parameters == ("owner", "repo")
+        assert plan.query_parameters == ()
+        assert set(plan.body_parameters) == {"name", "head_sha", "status"}
+        assert plan.required == frozenset(["owner", "repo"])
+        assert plan.valid_parameters == frozenset(["accept", "owner", "repo", "name", "head_sha", "status"])
+        assert plan.defaults == {"status": "queued"}
+
+    def test_plan_is_immutable(self):
+        plan = compile_plan(self.definition, "post", "/repos/{owner}/{repo}/check-runs")
+        with pytest.raises(AttributeError):
+            plan.method = "get"
+        with pytest.raises(TypeError):
+            plan.defaults["status"] = "completed"
+
+    @property
+    def definition(self):
+        return {
+            "parameters": [
+                {"name": "accept", "in": "header", "schema": {"type": "string"}},
+                {"name": "owner", "in": "path", "required": True, "schema": {"type": "string"}},
+                {"name": "repo", "in": "path", "required": True, "schema": {"type": "string"}},
+            ],
+            "requestBody": {
+                "content": {
+                    "application/json": {
+                        "schema": {
+                            "type": "object",
+                            "properties": {
+                                "name": {"type": "string"},
+                                "head_sha": {"type": "string"},
+                                "status": {"type": "string", "enum": ["queued", "completed"], "default": "queued"},
+                            },
+                            "required": ["name", "head_sha"],
+                        }
+                    }
+                }
+            },
+        }
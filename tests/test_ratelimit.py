@@ -0,0 +1,113 @@
+import pytest
+
+from conftest import Clock
+from conftest import make_response
+from octokit import Octokit
+from octokit import errors
+from octokit.ratelimit import RateLimiter
+from octokit.ratelimit import get_resource
+
+
+def limit_headers(remaining, reset, resource="core"):
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+class TestRateLimiter(object):
+    def test_resources_are_derived_from_the_url(self):
+        assert get_resource("https://api.github.com/repos/o/r") == "core"
+        assert get_resource("https://api.github.com/search/issues") == "search"
+        assert get_resource("https://api.github.com/graphql") == "graphql"
+        assert get_resource("https://api.github.com/search/code?q=octokit") == "code_search"
+        assert get_resource("https://api.github.com/app-manifests/abc/conversions") == "integration_manifest"
+
+    def test_responses_update_the_budget_of_the_request(self):
+        clock = Clock()
+        sut = RateLimiter(clock=clock)
+        key = sut.key("https://api.github.com/search/code?q=octokit", {})
+        limited = make_response(403, headers=dict(limit_headers(9, clock.now + 60, "search"), **{"Retry-After": "30"}))
+        assert sut.update(key, limited)
+        assert sut.acquire(key) == 30
+        assert sut.acquire(sut.key("https://api.github.com/search/issues", {})) == 0
+
+    def test_budgets_are_kept_per_identity_and_resource(self):
+        sut = RateLimiter()
+        yak = sut.key("https://api.github.com/repos/o/r", {"headers": {"Authorization": "token yak"}})
+        other = sut.key("https://api.github.com/repos/o/r", {"headers": {"Authorization": "token other"}})
+        search = sut.key("https://api.github.com/search/issues", {"headers": {"Authorization": "token yak"}})
+        assert len({yak, other, search}) == 3
+        assert "yak" not in yak[0]
+
+    def test_does_not_wait_before_the_budget_is_known(self):
+        sut = RateLimiter(burst=1)
+        key = ("identity", "core")
+        assert [sut.acquire(key) for _ in range(5)] == [0, 0, 0, 0, 0]
+
+    def test_paces_requests_across_the_reset_window(self):
+        clock = Clock()
+        sut = RateLimiter(burst=2, clock=clock)
+        key = ("identity", "core")
+        sut.update(key, make_response(headers=limit_headers(remaining=100, reset=clock.now + 100)))
+        assert sut.budget(key).rate == 1
+        assert sut.acquire(key) == 0
+        assert sut.acquire(key) == 0
+        assert sut.acquire(key) == pytest.approx(1)
+        clock.now += 1
+        assert sut.acquire(key) == pytest.approx(1)
+
+    def test_waits_for_the_reset_when_the_budget_is_exhausted(self):
+        clock = Clock()
+        sut = RateLimiter(clock=clock)
+        key = ("identity", "core")
+        sut.update(key, make_response(headers=limit_headers(remaining=0, reset=clock.now + 30)))
+        assert sut.acquire(key) == 30
+
+    def test_pauses_on_secondary_rate_limits(self):
+        clock = Clock()
+        sut = RateLimiter(clock=clock, secondary_wait=60)
+        key = ("identity", "core")
+        limited = make_response(403, content=b'{"message": "You have exceeded a secondary rate limit."}')
+        assert sut.update(key, limited)
+        assert sut.acquire(key) == 60
+        assert sut.update(key, make_response(403, headers={"Retry-After": "90"}))
+        assert sut.acquire(key) == 90
+        assert not sut.update(key, make_response(403, content=b'{"message": "Resource not accessible"}'))
+
+    def test_raises_when_the_wait_is_longer_than_max_wait(self):
+        clock = Clock()
+        sut = RateLimiter(clock=clock, max_wait=10)
+        key = ("identity", "core")
+        sut.update(key, make_response(429, headers={"Retry-After": "3600"}))
+        with pytest.raises(errors.OctokitRateLimitError):
+            sut.acquire(key)
+
+    @pytest.mark.parametrize("max_attempts", [0, -1])
+    def test_requests_are_sent_at_least_once(self, max_attempts):
+        with pytest.raises(ValueError):
+            RateLimiter(max_attempts=max_attempts)
+
+
+class TestClientRateLimiting(object):
+    def test_rate_limited_requests_are_paused_and_sent_again(self, mocker):
+        sleep = mocker.patch("time.sleep")
+        get = mocker.patch("requests.Session.get")
+        get.side_effect = [make_response(403, headers={"Retry-After": "5"}), make_response(200)]
+        octokit = Octokit(auth="token", token="yak", rate_limiter=RateLimiter())
+        sut = octokit.repos.get(owner="octokit", repo="octokit.py")
+        assert sut._response.status_code == 200
+        assert get.call_count == 2
+        assert sleep.call_args_list[-1][0][0] == pytest.approx(5, abs=1)
+
+    def test_budget_is_tracked_from_responses(self, mocker):
+        mocker.patch("time.sleep")
+        get = mocker.patch("requests.Session.get")
+        get.return_value = make_response(headers=limit_headers(remaining=4000, reset=2000000000))
+        limiter = RateLimiter()
+        Octokit(auth="token", token="yak", rate_limiter=limiter).repos.get(owner="octokit", repo="octokit.py")
+        url = "https://api.github.com/repos/octokit/octokit.py"
+        key = limiter.key(url, {"headers": {"Authorization": "token yak"}})
+        assert limiter.budget(key).remaining == 4000
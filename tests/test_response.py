@@ -0,0 +1,53 @@
+import pytest
+
+from octokit import ResponseData
+from octokit import ResponseList
+from octokit.response import wrap
+
+
+class TestResponseData(object):
+    def test_attribute_access_over_nested_data(self):
+        sut = wrap(self.data)
+        assert sut.full_name == "octokit/octokit.py"
+        assert sut.owner.login == "octokit"
+        assert sut.topics[1] == "python"
+        assert sut.labels[0].name == "bug"
+
+    def test_no_class_is_created_per_object(self):
+        sut = wrap(self.data)
+        assert type(sut) is ResponseData
+        assert type(sut.owner) is ResponseData
+        assert type(sut.labels) is ResponseList
+        assert not hasattr(sut, "__dict__")
+
+    def test_values_are_wrapped_lazily(self):
+        data = self.data
+        sut = wrap(data)
+        assert sut._data is data
+        assert sut.owner._data is data["owner"]
+
+    def test_missing_attributes_raise_attribute_error(self):
+        with pytest.raises(AttributeError):
+            wrap(self.data).missing
+
+    def test_lists_behave_like_sequences(self):
+        sut = wrap([{"id": 1}, {"id": 2}, {"id": 3}])
+        assert len(sut) == 3
+        assert [item.id for item in sut] == [1, 2, 3]
+        assert [item.id for item in sut[1:]] == [2, 3]
+        assert sut == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_dir_lists_keys(self):
+        assert {"full_name", "owner"} <= set(dir(wrap(self.data)))
+
+    def test_non_identifier_keys_are_available_with_getattr(self):
+        assert getattr(wrap({"+1": 3}), "+1") == 3
+
+    @property
+    def data(self):
+        return {
+            "full_name": "octokit/octokit.py",
+            "owner": {"login": "octokit"},
+            "topics": ["github", "python"],
+            "labels": [{"name": "bug"}],
+        }
@@ -0,0 +1,85 @@
+import pytest
+import requests
+
+from conftest import Clock
+from conftest import make_response
+from octokit import Octokit
+from octokit.retry import RetryBudget
+from octokit.retry import RetryPolicy
+
+
+class TestRetryPolicy(object):
+    def test_backoff_is_exponential_with_full_jitter(self, mocker):
+        uniform = mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        sut = RetryPolicy(max_attempts=10, backoff=1, max_backoff=5)
+        delays = [sut.next_delay(attempt, 0, make_response(503)) for attempt in range(4)]
+        assert delays == [1, 2, 4, 5]
+        assert uniform.call_args_list[0][0] == (0, 1)
+
+    def test_stops_after_max_attempts(self):
+        sut = RetryPolicy(max_attempts=2)
+        assert sut.next_delay(0, 0, make_response(502)) is not None
+        assert sut.next_delay(1, 0, make_response(502)) is None
+
+    def test_only_transient_failures_are_retried(self):
+        sut = RetryPolicy()
+        assert sut.next_delay(0, 0, make_response(404)) is None
+        assert sut.next_delay(0, 0, error=ValueError()) is None
+        assert sut.next_delay(0, 0, error=requests.ConnectionError()) is not None
+
+    def test_deadline_caps_the_total_time(self, mocker):
+        mocker.patch("random.uniform", side_effect=lambda low, high: high)
+        clock = Clock(0)
+        sut = RetryPolicy(backoff=1, deadline=10, clock=clock)
+        clock.now = 8.5
+        assert sut.next_delay(0, 0, make_response(503)) == 1
+        clock.now = 9.5
+        assert sut.next_delay(0, 0, make_response(503)) is None
+
+    def test_idempotent_methods_are_retried_by_default(self):
+        sut = RetryPolicy(operations=["issues/create"])
+        plan = Octokit().repos.get.operation.plan
+        assert sut.applies_to(plan)
+        assert not sut.applies_to(Octokit().pulls.create.operation.plan)
+        assert sut.applies_to(Octokit().issues.create.operation.plan)
+
+
+class TestRetryBudget(object):
+    def test_retries_are_limited_to_a_ratio_of_requests(self):
+        clock = Clock(0)
+        sut = RetryBudget(ratio=0.5, min_retries=1, window=10, clock=clock)
+        for _ in range(4):
+            sut.record_request()
+        assert [sut.withdraw() for _ in range(4)] == [True, True, True, False]
+        clock.now = 10
+        assert sut.withdraw()
+
+
+class TestClientRetries(object):
+    def test_transient_failures_are_retried(self, mocker):
+        sleep = mocker.patch("time.sleep")
+        get = mocker.patch("requests.Session.get")
+        get.side_effect = [requests.ConnectionError(), make_response(503), make_response(200)]
+        sut = Octokit(retry=RetryPolicy(max_attempts=3)).repos.get(owner="octokit", repo="octokit.py")
+        assert sut._response.status_code == 200
+        assert get.call_count == 3
+        assert sleep.call_count == 2
+
+    def test_last_error_is_raised_when_attempts_run_out(self, mocker):
+        mocker.patch("time.sleep")
+        get = mocker.patch("requests.Session.get")
+        get.side_effect = requests.ConnectionError()
+        with pytest.raises(requests.ConnectionError):
+            Octokit(retry=RetryPolicy(max_attempts=2)).repos.get(owner="octokit", repo="octokit.py")
+        assert get.call_count == 2
+
+    def test_post_is_not_retried_unless_opted_in(self, mocker):
+        mocker.patch("time.sleep")
+        post = mocker.patch("requests.Session.post")
+        post.return_value = make_response(502)
+        Octokit(retry=RetryPolicy()).issues.create(owner="octokit", repo="octokit.py", title="t")
+        assert post.call_count == 1
+        Octokit(retry=RetryPolicy(operations=["issues/create"])).issues.create(
+            owner="octokit", repo="octokit.py", title="t"
+        )
+        assert post.call_count == 4
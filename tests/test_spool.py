@@ -0,0 +1,120 @@
+import sqlite3
+import threading
+
+import pytest
+
+from octokit import errors
+from octokit.spool import Spool
+from octokit.spool import SpoolConsumer
+
+
+@pytest.fixture
+def spool(tmp_path):
+    spool = Spool(tmp_path / "spool.db")
+    yield spool
+    spool.close()
+
+
+class TestSpool(object):
+    def test_appended_deliveries_can_be_read_back(self, spool):
+        first = spool.append("push", b'{"ref": "main"}', "guid-1", {"X-GitHub-Event": "push"})
+        second = spool.append("issues", memoryview(b"{}"), "guid-2")
+        assert second == first + 1
+        deliveries = spool.read(first)
+        assert [(d.offset, d.delivery_id, d.event, d.body) for d in deliveries] == [
+            (first, "guid-1", "push", b'{"ref": "main"}'),
+            (second, "guid-2", "issues", b"{}"),
+        ]
+        assert deliveries[0].headers == {"X-GitHub-Event": "push"}
+
+    def test_queued_deliveries_are_committed_in_one_batch(self, spool, mocker):
+        commit = mocker.spy(spool, "_commit")
+        spool._start_writer = lambda: None
+        futures = [spool.append("push", b"{}", wait=False) for _ in range(10)]
+        del spool._start_writer
+        spool._start_writer()
+        assert [future.result() for future in futures] == list(range(1, 11))
+        assert commit.call_count == 1
+
+    def test_concurrent_appends_get_distinct_offsets(self, spool):
+        offsets = []
+        threads = [
+            threading.Thread(target=lambda: offsets.extend([spool.append("push", b"{}") for _ in range(20)]))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(offsets) == list(range(1, 101))
+
+    def test_deliveries_survive_reopening(self, tmp_path):
+        spool = Spool(tmp_path / "spool.db")
+        futures = [spool.append("push", b"{}", wait=False) for _ in range(3)]
+        assert [future.result() for future in futures] == [1, 2, 3]
+        spool.close()
+        spool = Spool(tmp_path / "spool.db")
+        assert len(spool.read()) == 3
+        spool.close()
+
+    def test_appends_fail_once_the_spool_is_closed(self, tmp_path):
+        spool = Spool(tmp_path / "spool.db")
+        spool.append("push", b"{}")
+        spool.close()
+        with pytest.raises(ValueError):
+            spool.append("push", b"{}")
+
+    def test_pending_appends_fail_when_the_writer_fails(self, spool, mocker):
+        connect = spool._connect
+        mocker.patch.object(spool, "_connect", side_effect=sqlite3.OperationalError("disk I/O error"))
+        with pytest.raises(sqlite3.OperationalError):
+            spool.append("push", b"{}", timeout=5)
+        spool._connect = connect
+        assert spool.append("push", b"{}", timeout=5) == 1
+
+    def test_appends_time_out(self, spool):
+        spool._start_writer = lambda: None
+        with pytest.raises(errors.OctokitTimeoutError):
+            spool.append("push", b"{}", timeout=0.01)
+        del spool._start_writer
+
+
+class TestSpoolConsumer(object):
+    def test_drain_hands_every_delivery_once(self, spool):
+        for i in range(5):
+            spool.append("push", str(i).encode())
+        handled = []
+        sut = SpoolConsumer(spool, batch_size=2)
+        assert sut.drain(lambda delivery: handled.append(delivery.body)) == 5
+        assert handled == [b"0", b"1", b"2", b"3", b"4"]
+        assert sut.drain(handled.append) == 0
+        assert sut.offset == 6
+
+    def test_batches_are_handled_again_after_a_failure(self, spool):
+        for i in range(4):
+            spool.append("push", str(i).encode())
+        handled = []
+
+        def handler(delivery):
+            if delivery.body == b"3" and b"3" not in handled:
+                handled.append(delivery.body)
+                raise RuntimeError()
+            handled.append(delivery.body)
+
+        sut = SpoolConsumer(spool, batch_size=2)
+        with pytest.raises(RuntimeError):
+            sut.drain(handler)
+        assert sut.offset == 3
+        sut.drain(handler)
+        assert handled == [b"0", b"1", b"2", b"3", b"2", b"3"]
+
+    def test_consumers_can_replay_from_an_offset(self, spool):
+        for i in range(3):
+            spool.append("push", str(i).encode())
+        first, second = SpoolConsumer(spool, "first"), SpoolConsumer(spool, "second")
+        first.drain(lambda delivery: None)
+        assert second.offset == 1
+        first.seek(2)
+        assert [d.body for d in first.poll()] == [b"1", b"2"]
+        spool.truncate(first.offset)
+        assert [d.offset for d in spool.read()] == [2, 3]
@@ -0,0 +1,32 @@
+from octokit import Octokit
+from octokit.template import URLTemplate
+
+
+class TestURLTemplate(object):
+    def test_template_is_parsed_into_literals_and_names(self):
+        sut = URLTemplate("/repos/{owner}/{repo}/issues/{issue_number}")
+        assert sut.literals == ("/repos/", "/", "/issues/", "")
+        assert sut.names == ("owner", "repo", "issue_number")
+
+    def test_expand(self):
+        sut = URLTemplate("/repos/{owner}/{repo}/issues/{issue_number}")
+        assert sut.expand({"owner": "me", "repo": "my_repo", "issue_number": 1}) == "/repos/me/my_repo/issues/1"
+
+    def test_expand_percent_encodes_values(self):
+        sut = URLTemplate("/repos/{owner}/{repo}/branches/{branch}/protection")
+        url = sut.expand({"owner": "me", "repo": "my repo", "branch": "feature/#12"})
+        assert url == "/repos/me/my%20repo/branches/feature%2F%2312/protection"
+
+    def test_missing_values_are_left_in_place(self):
+        assert URLTemplate("/users/{username}").expand({}) == "/users/{username}"
+
+    def test_template_without_variables(self):
+        assert URLTemplate("/user/repos").expand({"owner": "me"}) == "/user/repos"
+
+    def test_branch_names_are_quoted_in_requests(self, mocker):
+        requests_get = mocker.patch("requests.Session.get")
+        headers = {"accept": "application/vnd.github.v3+json", "Content-Type": "application/json"}
+        Octokit().repos.get_branch(owner="user", repo="repo", branch="release/1.0")
+        requests_get.assert_called_once_with(
+            "https://api.github.com/repos/user/repo/branches/release%2F1.0", params={}, headers=headers
+        )
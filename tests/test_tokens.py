@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+import pytest
+
+from conftest import Clock
+from octokit import Octokit
+from octokit import tokens
+from octokit.tokens import TOKEN_LIFETIME
+from octokit.tokens import InstallationTokenManager
+from octokit.tokens import app_jwt
+from octokit.tokens import get_token_manager
+from octokit.tokens import parse_timestamp
+
+Response = namedtuple("Response", ["json"])
+
+
+@pytest.fixture
+def private_key():
+    with open(os.path.join(os.path.dirname(__file__), "test.pem"), "r") as f:
+        return f.read()
+
+
+def token_response(token, expires_at="2099-01-01T00:00:00Z"):
+    return Response(json=lambda: {"token": token, "expires_at": expires_at})
+
+
+class AdvancingClock(object):
+    """Runs in real time, ``before`` seconds before the token of ``token_response`` expires."""
+
+    def __init__(self, before):
+        self.start = time.monotonic() - parse_timestamp("2099-01-01T00:00:00Z") + before
+
+    def __call__(self):
+        return time.monotonic() - self.start
+
+
+class TestInstallationTokenManager(object):
+    def test_installations_are_looked_up_directly(self, mocker, private_key):
+        get = mocker.patch("requests.Session.get", return_value=Response(json=lambda: {"id": 7}))
+        sut = InstallationTokenManager("42", private_key, background=False)
+        assert sut.installation_id(owner="octokit", repo="octokit.py") == 7
+        assert sut.installation_id(owner="octokit", repo="octokit.py") == 7
+        assert sut.installation_id(org="octokit") == 7
+        assert [c[0][0] for c in get.call_args_list] == [
+            "https://api.github.com/repos/octokit/octokit.py/installation",
+            "https://api.github.com/orgs/octokit/installation",
+        ]
+
+    def test_tokens_are_cached_per_installation_and_shared_by_clients(self, mocker, private_key):
+        get = mocker.patch("requests.Session.get")
+        post = mocker.patch("requests.Session.post", side_effect=[token_response("a"), token_response("b")])
+        manager = InstallationTokenManager("42", private_key, background=False)
+        first = Octokit(
+            auth="installation", app_id="42", private_key=private_key, installation_id=1, token_manager=manager
+        )
+        second = Octokit(
+            auth="installation", app_id="42", private_key=private_key, installation_id=1, token_manager=manager
+        )
+        other = Octokit(
+            auth="installation", app_id="42", private_key=private_key, installation_id=2, token_manager=manager
+        )
+        assert (first.token, second.token, other.token) == ("a", "a", "b")
+        assert post.call_count == 2
+        assert not get.called
+
+    def test_tokens_are_refreshed_inside_the_refresh_margin(self, mocker, private_key):
+        mocker.patch("requests.Session.get")
+        post = mocker.patch("requests.Session.post", side_effect=[token_response("a"), token_response("b")])
+        clock = Clock(parse_timestamp("2099-01-01T00:00:00Z") - 600)
+        sut = Octokit(
+            auth="installation",
+            app_id="42",
+            private_key=private_key,
+            installation_id=1,
+            token_manager=InstallationTokenManager(
+                "42", private_key, refresh_margin=300, background=False, clock=clock
+            ),
+        )
+        sut.repos.get(owner="octokit", repo="octokit.py")
+        assert sut.token == "a"
+        clock.now += 301
+        sut.repos.get(owner="octokit", repo="octokit.py")
+        assert sut.token == "b"
+        assert post.call_count == 2
+
+    def test_tokens_are_refreshed_in_the_background(self, mocker, private_key):
+        refreshed = threading.Event()
+        responses = [token_response("a"), token_response("b")]
+
+        def post(*args, **kwargs):
+            response = responses.pop(0)
+            if not responses:
+                refreshed.set()
+            return response
+
+        mocker.patch("requests.Session.post", side_effect=post)
+        sut = InstallationTokenManager("42", private_key, refresh_margin=300, clock=AdvancingClock(300.05))
+        assert sut.get(1).token == "a"
+        assert refreshed.wait(5)
+        sut.close()
+        assert sut._tokens[1].token == "b"
+
+    def test_one_thread_refreshes_every_installation(self, mocker, private_key):
+        mocker.patch("requests.Session.post", return_value=token_response("a"))
+        sut = InstallationTokenManager("42", private_key, refresh_margin=300, clock=AdvancingClock(600))
+        start = mocker.spy(threading.Thread, "start")
+        for installation_id in range(50):
+            sut.get(installation_id)
+        assert start.call_count == 1
+        assert len(sut._due) == 50
+        sut.close()
+
+    def test_idle_installations_are_not_refreshed_in_the_background(self, mocker, private_key):
+        post = mocker.patch("requests.Session.post", return_value=token_response("a"))
+        clock = Clock(parse_timestamp("2099-01-01T00:00:00Z") - 3600)
+        sut = InstallationTokenManager("42", private_key, background=False, clock=clock)
+        token = sut.get(1)
+        clock.now += 3300
+        sut._refresh_due(1, token)
+        assert post.call_count == 2
+        token = sut._tokens[1]
+        clock.now += TOKEN_LIFETIME + 1
+        sut._refresh_due(1, token)
+        assert post.call_count == 2
+        assert sut.get(1).token == "a"
+        assert post.call_count == 3
+
+    def test_concurrent_callers_fetch_one_token(self, mocker, private_key):
+        post = mocker.patch("requests.Session.post", return_value=token_response("a"))
+        sut = InstallationTokenManager("42", private_key, background=False)
+        threads = [threading.Thread(target=sut.get, args=(1,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert post.call_count == 1
+
+    def test_tokens_are_fetched_through_the_client_transport_with_a_timeout(self, mocker, private_key):
+        class RecordingTransport(object):
+            def __init__(self):
+                self.requests = []
+
+            def request(self, method, url, **kwargs):
+                self.requests.append((method, url, kwargs["timeout"]))
+                return Response(json=lambda: {"id": 7}) if method == "get" else token_response("a")
+
+        post = mocker.patch("requests.Session.post", return_value=token_response("b"))
+        transport = RecordingTransport()
+        manager = InstallationTokenManager("42", private_key, background=False)
+        Octokit(
+            auth="installation",
+            app_id="42",
+            private_key=private_key,
+            org="octokit",
+            token_manager=manager,
+            transport=transport,
+            timeout=3,
+        )
+        assert transport.requests == [
+            ("get", "https://api.github.com/orgs/octokit/installation", 3),
+            ("post", "https://api.github.com/app/installations/7/access_tokens", 3),
+        ]
+        manager.refresh(7)
+        assert transport.requests[-1][2] == 3
+        assert manager.refresh(8).token == "b"
+        assert post.call_args[1]["timeout"] == 10
+
+    def test_one_manager_per_app(self, private_key):
+        assert get_token_manager("42", private_key) is get_token_manager(42, private_key)
+        assert get_token_manager("42", private_key) is not get_token_manager("43", private_key)
+
+
+class TestAppJWT(object):
+    def test_jwt_is_reused_until_shortly_before_it_expires(self, mocker, private_key):
+        encode = mocker.spy(tokens.jwt, "encode")
+        clock = Clock(1000)
+        first = app_jwt("7", private_key, clock=clock)
+        clock.now += 8 * 60 - 1
+        assert app_jwt("7", private_key, clock=clock) == first
+        clock.now += 1
+        assert app_jwt("7", private_key, clock=clock) != first
+        assert encode.call_count == 2
+
+    def test_private_key_is_parsed_once(self, mocker, private_key):
+        construct = mocker.spy(tokens.jwk, "construct")
+        app_jwt("8", private_key, clock=Clock(1000))
+        app_jwt("9", private_key, clock=Clock(1000))
+        assert construct.call_count <= 1
+
+    def test_app_clients_share_the_signed_jwt(self, mocker, private_key):
+        mocker.patch("requests.Session.get")
+        encode = mocker.spy(tokens.jwt, "encode")
+        first = Octokit(auth="app", app_id="10", private_key=private_key)
+        second = Octokit(auth="app", app_id="10", private_key=private_key)
+        second.apps.get_authenticated()
+        assert first.jwt == second.jwt
+        assert encode.call_count == 1
@@ -0,0 +1,44 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from octokit import Octokit
+from octokit.transport import Transport
+from octokit.transport import get_default_transport
+
+
+class TestTransport(object):
+    def test_clients_share_the_default_transport(self):
+        assert Octokit().transport is Octokit().transport
+        assert Octokit().transport is get_default_transport()
+
+    def test_pool_options_create_a_private_transport(self):
+        sut = Octokit(pool_connections=4, pool_maxsize=32, pool_block=True)
+        adapter = sut.transport.session.get_adapter("https://api.github.com")
+        assert sut.transport is not get_default_transport()
+        assert adapter._pool_connections == 4
+        assert adapter._pool_maxsize == 32
+        assert adapter._pool_block is True
+
+    def test_keep_alive_can_be_disabled(self):
+        transport = Transport(keep_alive=False)
+        assert transport.session.headers["Connection"] == "close"
+
+    def test_passed_in_sessions_keep_their_adapters(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=3)
+        session.mount("https://", adapter)
+        transport = Transport(session=session)
+        assert transport.session.get_adapter("https://api.github.com") is adapter
+
+    def test_can_pass_in_a_transport(self, mocker):
+        transport = Transport(session=requests.Session())
+        get = mocker.patch.object(transport.session, "get")
+        sut = Octokit(transport=transport)
+        sut.oauth_authorizations.get_authorization(authorization_id=100)
+        get.assert_called_once_with("https://api.github.com/authorizations/100", params={}, headers=sut.headers)
+
+    def test_results_keep_the_client_transport(self, mocker):
+        mocker.patch("requests.Session.get")
+        transport = Transport()
+        sut = Octokit(transport=transport).oauth_authorizations.get_authorization(authorization_id=100)
+        assert sut.transport is transport
@@ -0,0 +1,81 @@
+import pytest
+
+from octokit import Octokit
+from octokit import errors
+from octokit.validators import SchemaValidator
+
+
+class TestSchemaValidator(object):
+    def test_validates_required_properties(self):
+        with pytest.raises(errors.OctokitParameterError) as e:
+            SchemaValidator(self.schema)({"labels": []})
+        assert "name is a required parameter" == str(e.value)
+
+    def test_validates_nested_enums(self):
+        data = {"name": "x", "output": {"title": "t", "level": "loud"}}
+        with pytest.raises(errors.OctokitParameterError) as e:
+            SchemaValidator(self.schema)(data)
+        assert "loud is not a valid option for level; must be one of ['notice', 'warning']" == str(e.value)
+
+    def test_unhashable_values_are_not_valid_enum_options(self):
+        with pytest.raises(errors.OctokitParameterError) as e:
+            SchemaValidator(self.schema)({"name": "x", "state": {}})
+        assert "{} is not a valid option for state; must be one of ['open', 'closed']" == str(e.value)
+
+    def test_validates_array_item_types(self):
+        with pytest.raises(errors.OctokitParameterError) as e:
+            SchemaValidator(self.schema)({"name": "x", "labels": [1]})
+        assert "int type does not match the schema type of string for the data of 1" == str(e.value)
+
+    def test_types_without_a_python_type_are_not_checked(self):
+        assert SchemaValidator(self.schema)({"name": "x", "lines": [1, 2]})
+
+    def test_fast_validation_only_checks_the_top_level(self):
+        sut = SchemaValidator(self.schema, nested=False)
+        assert sut({"name": "x", "output": {"level": "loud"}, "labels": [1]})
+        with pytest.raises(errors.OctokitParameterError):
+            sut({"name": "x", "state": "closeddddd"})
+
+    @property
+    def schema(self):
+        return {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "state": {"type": "string", "enum": ["open", "closed"]},
+                "labels": {"type": "array", "items": {"type": "string"}},
+                "lines": {"type": "array", "items": {"type": "integer"}},
+                "output": {
+                    "type": "object",
+                    "properties": {
+                        "title": {"type": "string"},
+                        "level": {"type": "string", "enum": ["notice", "warning"]},
+                    },
+                    "required": ["title"],
+                },
+            },
+            "required": ["name"],
+        }
+
+
+class TestValidationModes(object):
+    def test_strict_is_the_default(self):
+        assert Octokit().validation == "strict"
+
+    def test_unknown_modes_are_rejected(self):
+        with pytest.raises(AssertionError):
+            Octokit(validation="sometimes")
+
+    def test_fast_validation_skips_nested_schemas(self, mocker):
+        post = mocker.patch("requests.Session.post")
+        data = {"owner": "owner", "repo": "repo", "name": "name", "head_sha": "master", "output": {"title": "t"}}
+        Octokit(validation="fast").checks.create(**data)
+        assert post.called
+        with pytest.raises(errors.OctokitParameterError) as e:
+            Octokit(validation="fast").checks.create(notvalid=1, **data)
+        assert "notvalid is not a valid parameter" == str(e.value)
+
+    def test_validation_can_be_turned_off(self, mocker):
+        get = mocker.patch("requests.Session.get")
+        Octokit(validation="off").oauth_authorizations.list_grants(notvalid=1)
+        assert get.called
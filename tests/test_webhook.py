@@ -1,3 +1,5 @@
+import hashlib
+import hmac
 import json
 
 from octokit import webhook
@@ -127,3 +129,38 @@ class TestWebhook(object):
         secret = "secret"
         events = ["push"]
         assert webhook.verify(headers, payload, secret, events=events) is False
+
+    def test_sha256_signature_is_preferred(self):
+        payload = b'{"zen": "Design for failure."}'
+        headers = {
+            "X-Hub-Signature-256": "sha256=" + hmac.new(b"secret", payload, hashlib.sha256).hexdigest(),
+            "X-Hub-Signature": "sha1=" + hmac.new(b"secret", payload, hashlib.sha1).hexdigest(),
+        }
+        assert webhook.valid_signature(headers, payload, "secret")
+        headers["X-Hub-Signature-256"] = "sha256=" + hmac.new(b"other", payload, hashlib.sha256).hexdigest()
+        assert webhook.valid_signature(headers, payload, "secret") is False
+
+    def test_payloads_can_be_bytes_or_memoryviews(self):
+        payload = '{"zen": "Keep it logically awesome. ✨"}'.encode("utf-8")
+        headers = {"X-Hub-Signature-256": "sha256=" + hmac.new(b"secret", payload, hashlib.sha256).hexdigest()}
+        assert webhook.valid_signature(headers, payload, "secret")
+        assert webhook.valid_signature(headers, bytearray(payload), b"secret")
+        assert webhook.valid_signature(headers, memoryview(payload), "secret")
+        assert webhook.valid_signature(headers, payload.decode("utf-8"), "secret")
+
+    def test_pre_keyed_verifier_can_be_reused(self):
+        verifier = webhook.SignatureVerifier("secret")
+        for payload in (b"", b"{}", b"[1, 2]"):
+            headers = {"X-Hub-Signature-256": "sha256=" + hmac.new(b"secret", payload, hashlib.sha256).hexdigest()}
+            assert verifier.verify(headers, payload)
+            headers.update({"X-GitHub-Event": "push", "X-GitHub-Delivery": "72d3162f-cc78-11e3-81ab-4c9367dc0958"})
+            assert webhook.verify(headers, payload, verifier, events=["push"])
+
+    def test_missing_or_unknown_signatures_are_invalid(self):
+        assert webhook.valid_signature({}, b"", "secret") is False
+        assert webhook.valid_signature({"X-Hub-Signature-256": "md5=abc"}, b"", "secret") is False
+
+    def test_events_without_an_action_are_valid(self):
+        assert webhook.valid_event("pull_request", ["*"])
+        assert webhook.valid_event("pull_request.opened", ["*"])
+        assert webhook.valid_event("pull_requests", ["*"]) is False